@@ -8,35 +8,104 @@ bl_info = {
     "category": "Object",
 }
 
+import base64
 import bpy
+import fnmatch
+import json
+import numpy as np
 import os
+import queue
+import re
+import sqlite3
+import stat
+import time
 from bpy.app.handlers import persistent
+from mathutils import Vector
 from bpy_extras.io_utils import ImportHelper
+from bpy_extras.object_utils import world_to_camera_view
 from bpy.props import StringProperty
 
+from . import blendfile
+from . import catalogs
+from . import filewatch
+from . import manifest
+from . import statcache
+from . import variants
+from . import workers
+
 # ### Globals
 library_order = []
 expanded_states = {}
+selected_libraries = set()
 link_active_states = {}
 linked_elements = {}
 resolution_status = {}
 ephemerally_loaded_libraries = set()
 ephemeral_hidden_libraries = set()
 _RENDER_SWAPS = {}
-LO_SUFFIX = "_Lo.blend"
 
     
 # ### Helpers
+# normalize_filepath() results are memoized per (raw path, blend file path,
+# relative-path preference); the cache resets itself when either of the last
+# two changes and is cleared explicitly on load/save and relocation.
+_path_cache = {}
+_path_cache_state = {"key": None}
+_library_by_path = {}
+
+def clear_path_caches():
+    """Drop memoized path normalizations and the path -> Library table."""
+    _path_cache.clear()
+    invalidate_library_paths()
+
+def invalidate_library_paths():
+    """Drop the path -> Library table; the next find_library() rebuilds it."""
+    _library_by_path.clear()
+
 def normalize_filepath(filepath):
     """Return Blender-style forward-slash path (relative if prefs allow)."""
+    use_relative = bpy.context.preferences.filepaths.use_relative_paths
+    key = (bpy.data.filepath, use_relative)
+    if key != _path_cache_state["key"]:
+        clear_path_caches()
+        _path_cache_state["key"] = key
+    cached = _path_cache.get(filepath)
+    if cached is not None:
+        return cached
+
     abs_path = bpy.path.abspath(filepath)
-    if bpy.context.preferences.filepaths.use_relative_paths:
+    result = abs_path.replace("\\", "/")
+    if use_relative:
         try:
-            rel = bpy.path.relpath(abs_path)
-            return rel.replace("\\", "/")
+            result = bpy.path.relpath(abs_path).replace("\\", "/")
         except ValueError:
             pass
-    return abs_path.replace("\\", "/")
+    _path_cache[filepath] = result
+    return result
+
+def find_library(filepath):
+    """Return the Library whose normalized path equals filepath, or None.
+
+    A miss rebuilds the table once before giving up, so libraries repathed
+    outside the add-on are still found.
+    """
+    lib = _library_by_path.get(filepath)
+    if lib is not None:
+        try:
+            if normalize_filepath(lib.filepath) == filepath:
+                return lib
+        except ReferenceError:
+            pass
+
+    _library_by_path.clear()
+    for l in bpy.data.libraries:
+        _library_by_path.setdefault(normalize_filepath(l.filepath), l)
+    return _library_by_path.get(filepath)
+
+def set_library_filepath(lib, filepath):
+    """Point a library at a new file and invalidate the path lookup table."""
+    lib.filepath = filepath
+    invalidate_library_paths()
 
 def safe_library(id_block):
     """Return item.library or None if the pointer is already invalid."""
@@ -45,51 +114,369 @@ def safe_library(id_block):
     except ReferenceError:
         return None
 
-def force_viewport_refresh():
-    """Redraw every 3D viewport and update view layer in every Blender window."""
+def force_viewport_refresh(rows=True):
+    """Redraw every 3D viewport and update view layer in every Blender window.
+
+    rows=False leaves the panel row model alone, for callers that changed no
+    library or resolution state.
+    """
+    if rows:
+        tag_panel_rows()
     bpy.context.view_layer.update()
+    tag_redraw_viewports()
+
+def tag_redraw_viewports():
+    """Redraw every 3D viewport without touching the view layer (safe from timers)."""
     for window in bpy.context.window_manager.windows:
         for area in window.screen.areas:
             if area.type == 'VIEW_3D':
                 for region in area.regions:
                     region.tag_redraw()
 
+# #### Status line
+# Timers and background jobs cannot call Operator.report(); they leave their
+# last message here and the panel shows it until it is dismissed.
+_status = {"text": "", "level": 'INFO'}
+
+def set_status(text, level='INFO'):
+    """Show text in the panel's status line ('INFO', 'WARNING' or 'ERROR')."""
+    _status["text"] = text
+    _status["level"] = level
+    tag_redraw_viewports()
+
+def report_errors(what, errors):
+    """Put a summary of errors (one message per library) on the status line."""
+    if errors:
+        more = f" (+{len(errors) - 1} more)" if len(errors) > 1 else ""
+        set_status(f"{what}: {errors[0]}{more}", 'ERROR')
+
 def reload_library(lib):
     """Version-safe wrapper for Library.reload()."""
     try:
         lib.reload()
     except RuntimeError:
         lib.reload()  # Fallback for Blender 4.2
+    invalidate_library_index()
+    invalidate_footprints()
 
 # #### Dynamic Low/High-Res Helpers
+# Which files are resolutions of the same asset comes from the naming rules in
+# the add-on preferences (suffixes, proxy subfolders, several LOD levels).
+# variant_index scans each asset folder once in the background, so switching
+# and render swaps look their target up instead of guessing a file name.
+variant_index = variants.VariantIndex(variants.NamingRules.parse(variants.DEFAULT_RULES))
+
+def naming_rules():
+    return variant_index.rules
+
+def update_variant_rules(self, context):
+    if self.variant_rules != variant_index.rules.source:
+        variant_index.set_rules(variants.NamingRules.parse(self.variant_rules))
+        prefetch_library_stats(link_active_states)
+    tag_panel_rows()
+
+def variant_level(path: str) -> int:
+    """LOD level of path per the naming rules (0 = full detail)."""
+    return naming_rules().classify(library_abspath(path))[2]
+
 def is_lo_file(path: str) -> bool:
-    """True if path ends with the low-res suffix."""
-    return normalize_filepath(path).endswith(LO_SUFFIX)
+    """True if the naming rules mark path as a reduced-detail variant."""
+    return variant_level(path) > 0
 
 def get_hi_res_path(path: str) -> str:
-    """Convert a low-res path to its hi-res counterpart."""
+    """Full-detail member of path's variant family."""
+    folder, stem, level = naming_rules().classify(library_abspath(path))
+    if level == 0:
+        return normalize_filepath(path)
+    return normalize_filepath(os.path.join(folder, stem + ".blend"))
+
+def low_res_path(path: str) -> str:
+    """Reduced-detail member of path's family at the preferred LOD level.
+
+    Uses the nearest level that exists on disk once the folder is indexed,
+    and the first naming rule of the preferred level until then.
+    """
+    rules = naming_rules()
+    folder, stem, _ = rules.classify(library_abspath(path))
+    prefs = addon_prefs()
+    preferred = min(prefs.lo_level if prefs else 1, max(rules.depth - 1, 1))
+    family = variant_index.family(library_abspath(path))
+    levels = [level for level in (family or {}) if level > 0]
+    if levels:
+        return normalize_filepath(family[min(levels, key=lambda level: (abs(level - preferred), level))])
+    return normalize_filepath(rules.candidate(folder, stem, preferred))
+
+def variant_family(path: str) -> list:
+    """Known members of path's family (path itself included), full detail first."""
+    family = variant_index.family(library_abspath(path)) or {}
+    members = [normalize_filepath(family[level]) for level in sorted(family)]
     p = normalize_filepath(path)
-    return p[:-len(LO_SUFFIX)] + ".blend" if is_lo_file(p) else p
+    return members if p in members else [p] + members
 
 def lib_base(path: str) -> str:
-    """Strip '.blend' and any low-res suffix to obtain a library base key."""
-    p = normalize_filepath(path)
-    if p.endswith(LO_SUFFIX):
-        return p[:-len(LO_SUFFIX)]
-    return p[:-6] if p.lower().endswith(".blend") else p
+    """Family folder and stem of path, used as a library base key."""
+    folder, stem, _ = naming_rules().classify(library_abspath(path))
+    return normalize_filepath(os.path.join(folder, stem))
+
+# ### Library Index
+# One pass over bpy.data mapping each Library pointer to the datablocks it owns
+# and to the empties instancing its collections. Rebuilt lazily whenever the
+# datablock counts change or invalidate_library_index() is called; every
+# operator that links, deletes or reloads does so, which bumps the index
+# generation. Edits made outside the add-on can keep the counts unchanged, so
+# library_entry() also checks the wrappers it hands out.
+OTHER_ID_TYPES = ('lights', 'materials', 'cameras', 'meshes', 'armatures', 'curves',
+                  'lattices', 'metaballs', 'texts', 'grease_pencils', 'images')
+_library_index = {}
+_library_index_key = None
+_library_index_state = {"generation": 0}
+
+def _library_index_signature():
+    data = bpy.data
+    return (_library_index_state["generation"], len(data.libraries), len(data.collections), len(data.objects),
+            tuple(l.as_pointer() for l in data.libraries))
+
+def invalidate_library_index():
+    """Force the next get_library_index() call to rebuild."""
+    _library_index_state["generation"] += 1
+
+def _index_entry_valid(entry, ptr):
+    """False if an ID in entry was removed or now belongs to another library."""
+    try:
+        for item in entry["collections"] + entry["objects"]:
+            lib = item.library
+            if lib is None or lib.as_pointer() != ptr:
+                return False
+        for objs in entry["instancers"].values():
+            for obj in objs:
+                if obj.instance_collection is None:
+                    return False
+    except ReferenceError:
+        return False
+    return True
+
+def _new_index_entry():
+    return {"collections": [], "objects": [], "instancers": {}, "data": {}}
+
+def get_library_index():
+    """Return {library pointer: entry}, rebuilding it if bpy.data changed."""
+    global _library_index_key
+    key = _library_index_signature()
+    if key == _library_index_key:
+        return _library_index
+
+    index = {}
+    for coll in bpy.data.collections:
+        lib = safe_library(coll)
+        if lib:
+            index.setdefault(lib.as_pointer(), _new_index_entry())["collections"].append(coll)
+    for obj in bpy.data.objects:
+        lib = safe_library(obj)
+        if lib:
+            index.setdefault(lib.as_pointer(), _new_index_entry())["objects"].append(obj)
+        if obj.type == 'EMPTY' and obj.instance_collection:
+            coll_lib = safe_library(obj.instance_collection)
+            if coll_lib:
+                entry = index.setdefault(coll_lib.as_pointer(), _new_index_entry())
+                entry["instancers"].setdefault(obj.instance_collection.name, []).append(obj)
+    for dt in OTHER_ID_TYPES:
+        for item in getattr(bpy.data, dt):
+            lib = safe_library(item)
+            if lib:
+                entry = index.setdefault(lib.as_pointer(), _new_index_entry())
+                entry["data"].setdefault(dt, []).append(item.name)
+
+    _library_index.clear()
+    _library_index.update(index)
+    _library_index_key = key
+    return _library_index
+
+def library_entry(library):
+    """Index entry for a library (empty entry if it owns nothing)."""
+    try:
+        ptr = library.as_pointer()
+    except ReferenceError:
+        return _new_index_entry()
+    entry = get_library_index().get(ptr)
+    if entry is not None and not _index_entry_valid(entry, ptr):
+        invalidate_library_index()
+        entry = get_library_index().get(ptr)
+    return entry or _new_index_entry()
+
+def library_instancers(library, names=None):
+    """Empties instancing collections of this library, optionally limited to names."""
+    empties = []
+    for coll_name, objs in library_entry(library)["instancers"].items():
+        if names is None or coll_name in names:
+            empties.extend(objs)
+    return empties
+
+def remove_library_instancers(library, names, collection=None):
+    """Delete the empties (in collection, or anywhere) that instance the named collections of library."""
+    members = {o.name for o in collection.objects} if collection is not None else None
+    for obj in library_instancers(library, names):
+        if members is None or obj.name in members:
+            bpy.data.objects.remove(obj, do_unlink=True)
+    invalidate_library_index()
 
 # ### Linked-Item Capture
+def active_collection(context=None):
+    """Active layer collection, also usable from timers where context has no view layer."""
+    context = context or bpy.context
+    view_layer = getattr(context, "view_layer", None)
+    if view_layer is None:
+        windows = context.window_manager.windows
+        view_layer = windows[0].view_layer if windows else context.scene.view_layers[0]
+    return view_layer.active_layer_collection.collection
+
+# #### Instance snapshots
+# The instance empties of a library are captured as parallel lists plus one
+# (n, 16) float32 array: row i is the matrix_world of empty names[i], which
+# instances collections[i], is parented to parents[i] and linked into
+# owners[i]. Matrices move through foreach_get/foreach_set, so thousands of
+# empties cost a few calls instead of one Python round trip each.
+STAGING_COLLECTION = ".LinkManager Staging"
+
+def empty_snapshot():
+    return {"names": [], "collections": [], "owners": [], "parents": [],
+            "matrices": np.empty((0, 16), dtype=np.float32)}
+
+def snapshot_instances(empties):
+    """Capture every empty's name, instanced collection, owner, parent and matrix_world."""
+    snapshot = empty_snapshot()
+    if not empties:
+        return snapshot
+    objects = bpy.data.objects
+    count = len(objects)
+    uids = np.empty(count, dtype=np.int32)
+    matrices = np.empty(count * 16, dtype=np.float32)
+    objects.foreach_get("session_uid", uids)
+    objects.foreach_get("matrix_world", matrices)
+    row_of = dict(zip(uids.tolist(), range(count)))
+    snapshot["matrices"] = matrices.reshape(count, 16)[[row_of[o.session_uid] for o in empties]]
+    for obj in empties:
+        owner = next((c for c in obj.users_collection if c.library is None), None)
+        snapshot["names"].append(obj.name)
+        snapshot["collections"].append(obj.instance_collection.name if obj.instance_collection else "")
+        snapshot["owners"].append(owner.name if owner else "")
+        snapshot["parents"].append(obj.parent.name if obj.parent else "")
+    return snapshot
+
+def add_snapshot_row(snapshot, name, coll_name):
+    """Append an unparented row at the origin; returns its index."""
+    snapshot["names"].append(name)
+    snapshot["collections"].append(coll_name)
+    snapshot["owners"].append("")
+    snapshot["parents"].append("")
+    snapshot["matrices"] = np.vstack((snapshot["matrices"], np.identity(4, dtype=np.float32).reshape(1, 16)))
+    return len(snapshot["names"]) - 1
+
+def set_world_matrices(objs, matrices):
+    """foreach_set matrix_world on local objects via a temporary collection holding just them."""
+    if not objs:
+        return
+    staging = bpy.data.collections.new(STAGING_COLLECTION)
+    try:
+        for obj in objs:
+            staging.objects.link(obj)
+        staging.objects.foreach_set("matrix_world", np.ascontiguousarray(matrices, dtype=np.float32).ravel())
+    finally:
+        bpy.data.collections.remove(staging)
+
+def restore_instance_matrices(snapshot):
+    """Put the captured matrix_world back on the snapshot's empties that still exist."""
+    objs, rows = [], []
+    for i, name in enumerate(snapshot["names"]):
+        obj = bpy.data.objects.get((name, None))
+        if obj is not None and obj.type == 'EMPTY':
+            objs.append(obj)
+            rows.append(i)
+    set_world_matrices(objs, snapshot["matrices"][rows])
+
+class UniqueNames:
+    """Hands out object names not yet in use, without probing bpy.data per attempt.
+
+    Built once from the current object names; remembers the next free
+    numeric suffix per base name so each allocation is O(1) amortized.
+    """
+
+    def __init__(self, taken=None):
+        self.taken = set(o.name for o in bpy.data.objects) if taken is None else set(taken)
+        self.next_suffix = {}
+
+    def allocate(self, name, base=None):
+        """name if it is free, else base (default: name) with the next free .NNN suffix."""
+        if name not in self.taken:
+            self.taken.add(name)
+            return name
+        base = base or name
+        n = self.next_suffix.get(base, 1)
+        while f"{base}.{n:03d}" in self.taken:
+            n += 1
+        self.next_suffix[base] = n + 1
+        name = f"{base}.{n:03d}"
+        self.taken.add(name)
+        return name
+
+def create_instance_empties(snapshot, rows, collections, fallback, names=None, made=None):
+    """Recreate the empties of the given snapshot rows in one batch and return them.
+
+    collections maps collection names to the datablocks to instance; rows
+    whose collection is missing are skipped. Empties go back into their
+    owner collection when it still exists, else into fallback. With a
+    UniqueNames in names, taken names get a numbered suffix instead of
+    Blender's own renaming. made collects {captured name: new empty} so
+    parents created by an earlier batch can be found.
+    """
+    made = {} if made is None else made
+    created, created_rows = [], []
+    targets = {}  # collection pointer -> (collection, [empties])
+    owners = {}
+    for i in rows:
+        coll_name = snapshot["collections"][i]
+        coll = collections.get(coll_name)
+        if coll is None:
+            continue
+        name = snapshot["names"][i]
+        if names is not None:
+            name = names.allocate(name, f"{coll_name}_instance")
+        empty = bpy.data.objects.new(name=name, object_data=None)
+        empty.instance_type = 'COLLECTION'
+        empty.instance_collection = coll
+        empty.rotation_mode = 'QUATERNION'
+        owner_name = snapshot["owners"][i]
+        if owner_name not in owners:
+            owners[owner_name] = bpy.data.collections.get((owner_name, None)) if owner_name else None
+        target = owners[owner_name] or fallback
+        targets.setdefault(target.as_pointer(), (target, []))[1].append(empty)
+        made[snapshot["names"][i]] = empty
+        created.append(empty)
+        created_rows.append(i)
+    for target, empties in targets.values():
+        link = target.objects.link
+        for empty in empties:
+            link(empty)
+    for empty, i in zip(created, created_rows):
+        parent_name = snapshot["parents"][i]
+        if parent_name:
+            parent = made.get(parent_name) or bpy.data.objects.get((parent_name, None))
+            if parent is not None and parent != empty:
+                empty.parent = parent
+    set_world_matrices(created, snapshot["matrices"][created_rows])
+    return created
+
 def get_linked_item_names(library):
     try:
-        lib_fp_norm = normalize_filepath(library.filepath)
+        library.filepath
     except ReferenceError:
         return {}
 
+    entry = library_entry(library)
     result = {}
     collections = []
     collection_instances = {}  # Dictionary to map collection names to empty names
     objects = []
-    transforms = {}
+    instancers = {}  # pointer -> empty, every instance of every collection
 
     abs_fp = bpy.path.abspath(library.filepath)
     is_relative = False
@@ -107,58 +494,46 @@ def get_linked_item_names(library):
         "instance_object_data": False
     }
 
-    active_col = bpy.context.view_layer.active_layer_collection.collection
-    for coll in bpy.data.collections:
-        lib = safe_library(coll)
-        if lib and normalize_filepath(lib.filepath) == lib_fp_norm:
-            collections.append(coll.name)
-            is_instanced = False
-            for obj in bpy.data.objects:
-                if obj.type == 'EMPTY' and obj.instance_collection == coll:
-                    empty_name = obj.name if obj.name and obj.name != "Collection_Instances" else coll.name
-                    collection_instances[coll.name] = empty_name
-                    is_instanced = True
-                    obj.rotation_mode = 'QUATERNION'
-                    transforms[coll.name] = {
-                        'location': list(obj.location),
-                        'rotation': list(obj.rotation_quaternion),
-                        'scale': list(obj.scale)
-                    }
-                    break
-            options["instance_collections"] = is_instanced
-            if not is_instanced and coll.name in [c.name for c in active_col.children]:
-                options["instance_collections"] = False
-
-    for obj in bpy.data.objects:
-        lib = safe_library(obj)
-        if lib and normalize_filepath(lib.filepath) == lib_fp_norm:
-            if obj.type == 'EMPTY' and obj.instance_collection:
-                if obj.instance_collection.name not in collections:
-                    collections.append(obj.instance_collection.name)
-                if obj.instance_collection.name not in collection_instances:
-                    collection_instances[obj.instance_collection.name] = obj.name
-                options["instance_collections"] = True
-                obj.rotation_mode = 'QUATERNION'
-                transforms[obj.instance_collection.name] = {
-                    'location': list(obj.location),
-                    'rotation': list(obj.rotation_quaternion),
-                    'scale': list(obj.scale)
-                }
-            else:
-                obj_collection_names = [c.name for c in obj.users_collection]
-                if obj.name not in collection_instances.values() and (obj.name in [o.name for o in active_col.objects] or any(c in collections for c in obj_collection_names)):
-                    if obj.data and safe_library(obj.data) and normalize_filepath(obj.data.library.filepath) == lib_fp_norm:
-                        options["instance_object_data"] = True
-                        objects.append(obj.name)
-                    elif obj.name not in objects:
-                        objects.append(obj.name)
+    active_col = active_collection()
+    for coll in entry["collections"]:
+        collections.append(coll.name)
+        empties = entry["instancers"].get(coll.name)
+        is_instanced = bool(empties)
+        if empties:
+            obj = empties[0]
+            empty_name = obj.name if obj.name and obj.name != "Collection_Instances" else coll.name
+            collection_instances[coll.name] = empty_name
+            instancers.update((o.as_pointer(), o) for o in empties)
+        options["instance_collections"] = is_instanced
+
+    collection_names = set(collections)
+    active_objects = {o.name for o in active_col.objects}
+    instance_names = set(collection_instances.values())
+    seen = set()
+    for obj in entry["objects"]:
+        if obj.type == 'EMPTY' and obj.instance_collection:
+            inst_name = obj.instance_collection.name
+            if inst_name not in collection_names:
+                collections.append(inst_name)
+                collection_names.add(inst_name)
+            if inst_name not in collection_instances:
+                collection_instances[inst_name] = obj.name
+                instance_names.add(obj.name)
+            options["instance_collections"] = True
+            instancers[obj.as_pointer()] = obj
+        elif obj.name not in seen and obj.name not in instance_names:
+            if obj.name in active_objects or any(c.name in collection_names for c in obj.users_collection):
+                if obj.data and safe_library(obj.data) == library:
+                    options["instance_object_data"] = True
+                objects.append(obj.name)
+                seen.add(obj.name)
 
     if collections:
         result['type'] = 'collections'
         result['collections'] = collections
         result['collection_instances'] = collection_instances
         result['options'] = options
-        result['transforms'] = transforms
+        result['transforms'] = snapshot_instances(list(instancers.values()))
         return result
     elif objects:
         result['type'] = 'objects'
@@ -166,107 +541,1943 @@ def get_linked_item_names(library):
         result['options'] = options
         return result
 
-    for dt in ('lights', 'materials', 'cameras', 'meshes', 'armatures', 'curves', 'lattices', 'metaballs', 'texts', 'grease_pencils', 'images'):
-        names = []
-        for item in getattr(bpy.data, dt):
-            lib = safe_library(item)
-            if lib and normalize_filepath(lib.filepath) == lib_fp_norm:
-                names.append(item.name)
-                if dt in ('meshes', 'armatures', 'curves', 'lattices', 'metaballs'):
-                    options["instance_object_data"] = True
-        if names:
-            result[dt] = names
+    for dt, names in entry["data"].items():
+        result[dt] = list(names)
+        if dt in ('meshes', 'armatures', 'curves', 'lattices', 'metaballs'):
+            options["instance_object_data"] = True
 
     result['type'] = 'other'
     result['options'] = options
     return result
 
 # ### Hi-Res Loader (Hidden)
-def load_highres_hidden(lo_fp):
-    def base(name):
-        for suf in ("_Lo", "_lo", "_Low", "_low"):
-            if name.endswith(suf):
-                return name[:-len(suf)]
-        return name
+def datablock_base(name):
+    """Strip a low-res suffix (per the naming rules) from a datablock name."""
+    for suf in naming_rules().name_suffixes():
+        if name.endswith(suf):
+            return name[:-len(suf)]
+    return name
+
+def load_highres_hidden(lo_fp, only=None):
+    """Link the hi-res counterparts of lo_fp's datablocks hidden; only limits it to those collection base names."""
+    hi_fp = resolution_status.get(lo_fp, {}).get("high_path")
+    # the file is read right after, so waiting on an unknown stat costs nothing extra
+    if not hi_fp or not library_exists(hi_fp, wait=True):
+        return False
 
-    hi_fp = resolution_status[lo_fp].get("high_path")
-    if not hi_fp or not os.path.exists(bpy.path.abspath(hi_fp)):
+    lo_lib = find_library(lo_fp)
+    if not lo_lib:
         return False
 
-    need_meshes = set()
-    need_colls = set()
-    for obj in bpy.data.objects:
-        lib = safe_library(obj)
-        if not lib or normalize_filepath(lib.filepath) != lo_fp:
-            continue
+    entry = library_entry(lo_lib)
+    need_meshes = {datablock_base(n) for n in entry["data"].get("meshes", [])}
+    need_colls = {datablock_base(c.name) for c in entry["collections"]}
+    for obj in entry["objects"]:
         if obj.type == 'MESH':
-            need_meshes.add(base(obj.data.name))
+            need_meshes.add(datablock_base(obj.data.name))
         elif obj.type == 'EMPTY' and obj.instance_collection:
-            need_colls.add(base(obj.instance_collection.name))
+            need_colls.add(datablock_base(obj.instance_collection.name))
+
+    if only is not None:
+        need_meshes = set()
+        need_colls &= only
 
     if not need_meshes and not need_colls:
         return False
 
+    hi_catalog = library_catalog(hi_fp)
+    if hi_catalog and not any(datablock_base(n) in need_colls for n in hi_catalog.get("collections", [])) \
+            and not any(datablock_base(n) in need_meshes for n in hi_catalog.get("meshes", [])):
+        return False
+
     try:
         with bpy.data.libraries.load(hi_fp, link=True) as (src, dst):
-            dst.meshes = [m for m in src.meshes if base(m) in need_meshes]
-            dst.collections = [c for c in src.collections if base(c) in need_colls]
+            dst.meshes = [m for m in hi_catalog.get("meshes", src.meshes) if datablock_base(m) in need_meshes]
+            dst.collections = [c for c in hi_catalog.get("collections", src.collections)
+                               if datablock_base(c) in need_colls]
     except Exception:
         return False
+    invalidate_library_index()
 
-    lib = next((l for l in bpy.data.libraries if normalize_filepath(l.filepath) == hi_fp), None)
+    lib = find_library(hi_fp)
     if lib:
         ephemerally_loaded_libraries.add(lib)
         ephemeral_hidden_libraries.add(hi_fp)
+        tag_panel_rows()
         return True
     return False
 
+def prewarmed_library(hi_fp):
+    """The hidden hi-res library linked by load_highres_hidden(), if still present."""
+    if hi_fp not in ephemeral_hidden_libraries:
+        return None
+    lib = find_library(hi_fp)
+    return lib if lib in ephemerally_loaded_libraries else None
+
+def release_prewarmed(hi_fp):
+    """Remove a hidden hi-res library and forget it, moving hi-res instances back to low-res."""
+    hid = next((h for h in ephemerally_loaded_libraries if normalize_filepath(h.filepath) == hi_fp), None)
+    if hid:
+        lo_fp = next((fp for fp, rs in resolution_status.items()
+                      if rs.get("status") == "low" and rs.get("high_path") == hi_fp), None)
+        lo_lib = find_library(lo_fp) if lo_fp else None
+        if lo_lib:
+            _, hi_to_lo = instance_collection_maps(lo_lib, hid)
+            retarget_instances(library_instancers(hid), hi_to_lo)
+        ephemerally_loaded_libraries.discard(hid)
+        bpy.data.libraries.remove(hid)
+        invalidate_library_index()
+    ephemeral_hidden_libraries.discard(hi_fp)
+
+def lo_hi_pairs(lo_lib, hi_lib):
+    """(lo, hi) datablock pairs matched by base name for collections and meshes."""
+    lo_entry, hi_entry = library_entry(lo_lib), library_entry(hi_lib)
+    hi_colls = {datablock_base(c.name): c for c in hi_entry["collections"]}
+    pairs = [(c, hi_colls[datablock_base(c.name)]) for c in lo_entry["collections"]
+             if datablock_base(c.name) in hi_colls]
+    lo_meshes = [bpy.data.meshes.get((n, lo_lib.filepath)) for n in lo_entry["data"].get("meshes", [])]
+    hi_meshes = {datablock_base(n): bpy.data.meshes.get((n, hi_lib.filepath))
+                 for n in hi_entry["data"].get("meshes", [])}
+    for me in lo_meshes:
+        hi_me = me and hi_meshes.get(datablock_base(me.name))
+        if hi_me:
+            pairs.append((me, hi_me))
+    return pairs
+
+def instance_collection_maps(lo_lib, hi_lib):
+    """Lo -> Hi and Hi -> Lo collection maps keyed by collection pointer."""
+    lo_to_hi, hi_to_lo = {}, {}
+    for lo_id, hi_id in lo_hi_pairs(lo_lib, hi_lib):
+        if isinstance(lo_id, bpy.types.Collection):
+            lo_to_hi[lo_id.as_pointer()] = hi_id
+            hi_to_lo[hi_id.as_pointer()] = lo_id
+    return lo_to_hi, hi_to_lo
+
+def retarget_instances(empties, mapping):
+    """Point each empty's instance_collection at its counterpart. Returns the number changed."""
+    changed = 0
+    for obj in empties:
+        coll = obj.instance_collection
+        target = mapping.get(coll.as_pointer()) if coll else None
+        if target is not None:
+            obj.instance_collection = target
+            changed += 1
+    if changed:
+        invalidate_library_index()
+    return changed
+
+# ### Library Catalog
+# Datablock inventories read straight from the .blend with blendfile.py, so
+# libraries can be inspected without bpy.data.libraries.load(). Results are
+# kept in memory and persisted across sessions in the manifest database.
+# catalog_index reads and stores them on its own threads; the panel only asks
+# without waiting and shows "scanning" until the read lands.
+catalog_index = catalogs.CatalogIndex()
+_manifest = {"conn": None, "failed": False}
+
+def manifest_db_path():
+    """Location of the persistent manifest in the user's extension data directory."""
+    try:
+        base = bpy.utils.extension_path_user(__package__, create=True)
+    except (AttributeError, ValueError):
+        base = bpy.utils.user_resource('CONFIG', path="link_manager", create=True)
+    return os.path.join(base, "manifest.sqlite")
+
+def manifest_conn():
+    """Shared manifest connection, or None if the database cannot be opened."""
+    if _manifest["conn"] is None and not _manifest["failed"]:
+        try:
+            _manifest["conn"] = manifest.open_store(manifest_db_path())
+        except (sqlite3.Error, OSError):
+            _manifest["failed"] = True
+    return _manifest["conn"]
+
+def close_manifest():
+    if _manifest["conn"] is not None:
+        _manifest["conn"].close()
+    _manifest["conn"] = None
+    _manifest["failed"] = False
+
+def library_abspath(fp):
+    """Absolute, OS-normalized path used as the manifest key."""
+    return os.path.normpath(bpy.path.abspath(fp))
+
+# #### File stat cache
+# Every stat the UI needs goes through stat_cache: known library paths and
+# their lo/hi siblings are prefetched on worker threads and re-checked after
+# the TTL, so drawing and invoking operators never wait on network storage.
+stat_cache = statcache.StatCache()
+
+def library_exists(fp, default=False, wait=False):
+    """Whether fp's file exists per the stat cache; default while it is not known yet."""
+    return stat_cache.exists(library_abspath(fp), default, wait)
+
+def prefetch_library_stats(fps):
+    """Refresh the cached stats and variant families of fps and their lo/hi siblings in the background."""
+    paths = set()
+    for fp in fps:
+        paths.add(library_abspath(fp))
+        paths.add(library_abspath(resolution_target(fp)))
+    variant_index.prefetch(paths)
+    stat_cache.prefetch(paths)
+    if (stat_cache.pending or variant_index.pending or catalog_index.pending) \
+            and not bpy.app.timers.is_registered(_run_stat_refresh):
+        bpy.app.timers.register(_run_stat_refresh, first_interval=0.2)
+
+_stat_state = {"generation": None}
+
+def _run_stat_refresh():
+    generation = (stat_cache.generation, variant_index.generation, catalog_index.generation)
+    if generation != _stat_state["generation"]:
+        _stat_state["generation"] = generation
+        tag_panel_rows()
+        tag_redraw_viewports()
+    return 0.2 if stat_cache.pending or variant_index.pending or catalog_index.pending else None
+
+def update_stat_ttl(self, context):
+    stat_cache.ttl = self.stat_ttl
+
+# #### Duplicate libraries
+# The same file linked through a symlink, a hard link or a differently spelled
+# path becomes a second Library that is loaded again in full. Libraries are
+# grouped by (device, inode) once their stat is cached, and by real path when
+# the file is missing.
+_duplicates = {"key": None, "groups": []}
+
+def library_identity(lib):
+    """Key shared by Libraries reading the same physical file, or None while its stat is unknown."""
+    abs_fp = library_abspath(lib.filepath)
+    known, st = stat_cache.lookup(abs_fp)
+    if not known:
+        return None
+    if st is not None and st.st_ino:
+        return ("inode", st.st_dev, st.st_ino)
+    return ("path", os.path.normcase(os.path.realpath(abs_fp)))
+
+def duplicate_groups():
+    """Lists of two or more Libraries that read the same file, the one to keep first."""
+    key = (library_generation(), stat_cache.generation)
+    if key != _duplicates["key"]:
+        groups = {}
+        for lib in bpy.data.libraries:
+            identity = library_identity(lib)
+            if identity is not None:
+                groups.setdefault(identity, []).append(lib)
+        # keep a direct library over one linked through another file
+        _duplicates["groups"] = [sorted(g, key=lambda l: l.parent is not None)
+                                 for g in groups.values() if len(g) > 1]
+        _duplicates["key"] = key
+    return _duplicates["groups"]
+
+def library_duplicates(fp):
+    """fp's Library and every other Library reading the same file, or [] if it has none."""
+    lib = find_library(fp)
+    if lib is None:
+        return []
+    return next((g for g in duplicate_groups() if lib in g), [])
+
+def _catalog_entry(fp, wait):
+    """(catalog, pairing, (size, mtime_ns)) of fp, or None while its stat or catalog is pending."""
+    abs_fp = library_abspath(fp)
+    known, st = stat_cache.lookup(abs_fp, wait)
+    if not known:
+        return None
+    if st is None:
+        return {}, None, None
+    if catalog_index.db_path is None:
+        catalog_index.db_path = manifest_db_path()
+    key = (st.st_size, st.st_mtime_ns)
+    entry = catalog_index.lookup(abs_fp, key, wait)
+    return None if entry is None else (entry[0], entry[1], key)
+
+def library_catalog(fp, wait=True):
+    """{bpy.data collection name: [names]} stored in fp, cached on size/mtime ({} if unreadable).
+
+    Without wait, returns None while the catalog is still being read.
+    """
+    entry = _catalog_entry(fp, wait)
+    return None if entry is None else entry[0]
+
+def linkable_names(src, dt, names, catalog):
+    """Names of type dt to link, checked against the catalog when it lists that type."""
+    available = catalog.get(dt)
+    if available is None:
+        available = getattr(src, dt, [])
+    available = set(available)
+    return [n for n in names if n in available]
+
+def lo_hi_correspondence(lo_fp, hi_fp, wait=True):
+    """(matched, missing) low-res collection/mesh names with and without a hi-res counterpart.
+
+    Without wait, returns None while either catalog is still being read.
+    """
+    lo, hi = _catalog_entry(lo_fp, wait), _catalog_entry(hi_fp, wait)
+    if lo is None or hi is None:
+        return None
+    (lo_cat, pairing, lo_key), (hi_cat, _, hi_key) = lo, hi
+    if hi_key is None:
+        return [], []
+    hi_abs = library_abspath(hi_fp)
+    suffixes = list(naming_rules().name_suffixes())
+    if pairing and pairing.get("high_path") == hi_abs and pairing.get("high_signature") == list(hi_key) \
+            and pairing.get("suffixes") == suffixes:
+        return pairing["matched"], pairing["missing"]
+
+    matched, missing = [], []
+    for dt in ("collections", "meshes"):
+        hi_names = {datablock_base(n) for n in hi_cat.get(dt, [])}
+        for n in lo_cat.get(dt, []):
+            (matched if datablock_base(n) in hi_names else missing).append(n)
+    if lo_cat:
+        catalog_index.store_pairing(library_abspath(lo_fp), lo_key, {
+            "high_path": hi_abs,
+            "high_signature": list(hi_key),
+            "suffixes": suffixes,
+            "matched": matched,
+            "missing": missing,
+        })
+    return matched, missing
+
+# #### Background inspection
+# Bulk inventory of many libraries through a pool of headless Blender
+# processes (workers.py + inspect_worker.py). Results are drained into the
+# manifest from a timer so the UI thread never waits on a worker.
+_inspection = {"pool": None, "errors": []}
+
+def start_inspection(paths):
+    """Inspect paths in background Blender workers. Returns the number queued."""
+    paths = sorted({library_abspath(p) for p in paths if library_exists(p, default=True)})
+    if not paths:
+        return 0
+    cancel_inspection()
+    prefs = addon_prefs()
+    pool = workers.BlenderPool(bpy.app.binary_path, workers.worker_script("inspect_worker.py"),
+                               workers=prefs.worker_count if prefs else 0)
+    pool.submit(paths)
+    _inspection["pool"] = pool
+    _inspection["errors"] = []
+    bpy.app.timers.register(_drain_inspection, first_interval=0.25)
+    return len(paths)
+
+def cancel_inspection():
+    pool = _inspection["pool"]
+    if pool is not None:
+        pool.cancel()
+    _inspection["pool"] = None
+    if bpy.app.timers.is_registered(_drain_inspection):
+        bpy.app.timers.unregister(_drain_inspection)
+
+def _drain_inspection():
+    pool = _inspection["pool"]
+    if pool is None:
+        return None
+    conn = manifest_conn()
+    stored = False
+    while True:
+        try:
+            path, result = pool.results.get_nowait()
+        except queue.Empty:
+            break
+        if "error" in result:
+            _inspection["errors"].append(f"{os.path.basename(path)}: {result['error']}")
+            continue
+        catalog_index.invalidate(path)
+        stored = True
+        if conn:
+            try:
+                manifest.store(conn, path, result["inventory"], signature=tuple(result["signature"]))
+            except (sqlite3.Error, OSError):
+                pass
+    # progress is drawn straight from the pool; only new catalogs change the rows
+    if stored:
+        tag_panel_rows()
+    tag_redraw_viewports()
+    if pool.finished:
+        pool.shutdown()
+        _inspection["pool"] = None
+        report_errors("Inspection failed", _inspection["errors"])
+        return None
+    return 0.25
+
+def inspection_progress():
+    """(done, total) of the running inspection, or None."""
+    pool = _inspection["pool"]
+    return (pool.done, pool.total) if pool else None
+
+# #### Proxy generation
+# Low-res proxies are written from hi-res libraries by headless Blender
+# workers (proxy_worker.py): detail modifiers stripped, meshes decimated,
+# textures downscaled and packed, datablock names unchanged. The manifest
+# records each proxy's source signature and settings, so sources that did not
+# change are skipped on the pool's threads without starting a Blender. An
+# existing file the manifest has no record of was made by hand and is only
+# replaced when the user asks to overwrite.
+_proxies = {"pool": None, "errors": [], "written": 0, "skipped": 0, "kept": 0, "settings": None, "summary": ""}
+
+def proxy_settings():
+    prefs = addon_prefs()
+    rules = naming_rules()
+    return {
+        "rules": rules.source,
+        "level": min(prefs.lo_level if prefs else 1, max(rules.depth - 1, 1)),
+        "ratio": prefs.proxy_ratio if prefs else 0.25,
+        "max_texture": prefs.proxy_max_texture if prefs else 512,
+    }
+
+def proxy_target(path, settings):
+    """Where the proxy of the hi-res file at path is written."""
+    rules = naming_rules()
+    folder, stem, _ = rules.classify(path)
+    return rules.candidate(folder, stem, settings["level"])
+
+def start_proxy_generation(paths, force=False, overwrite=False):
+    """Write low-res proxies of the hi-res paths in background workers. Returns the number queued.
+
+    force regenerates up-to-date proxies; overwrite also replaces low-res
+    files that were not generated here.
+    """
+    paths = sorted({library_abspath(p) for p in paths
+                    if not is_lo_file(p) and library_exists(p, default=True)})
+    if not paths:
+        return 0
+    cancel_proxy_generation()
+    settings = proxy_settings()
+    conn = manifest_conn()
+    try:
+        records = {} if conn is None else manifest.proxy_records(conn)
+    except sqlite3.Error:
+        records = {}
+    targets = {p: proxy_target(p, settings) for p in paths}
+
+    def skip(path):
+        target = targets[path]
+        record = records.get(target)
+        if record is None:
+            if not overwrite and os.path.exists(target):
+                return {"target": target, "skipped": "existing"}
+            return None
+        if not force and manifest.proxy_current(record, path, target, settings):
+            return {"target": target, "skipped": "current"}
+        return None
+
+    prefs = addon_prefs()
+    pool = workers.BlenderPool(bpy.app.binary_path, workers.worker_script("proxy_worker.py"),
+                               workers=prefs.worker_count if prefs else 0, chunk_size=2,
+                               extra_args=[json.dumps(settings)], skip=skip)
+    pool.submit(paths)
+    _proxies.update(pool=pool, errors=[], written=0, skipped=0, kept=0, settings=settings, summary="")
+    bpy.app.timers.register(_drain_proxies, first_interval=0.5)
+    return len(paths)
+
+def cancel_proxy_generation():
+    pool = _proxies["pool"]
+    if pool is not None:
+        pool.cancel()
+    _proxies["pool"] = None
+    if bpy.app.timers.is_registered(_drain_proxies):
+        bpy.app.timers.unregister(_drain_proxies)
+
+def _drain_proxies():
+    pool = _proxies["pool"]
+    if pool is None:
+        return None
+    conn = manifest_conn()
+    written = _proxies["written"]
+    while True:
+        try:
+            path, result = pool.results.get_nowait()
+        except queue.Empty:
+            break
+        if "error" in result:
+            _proxies["errors"].append(f"{os.path.basename(path)}: {result['error']}")
+            continue
+        if result.get("skipped") == "existing":
+            _proxies["kept"] += 1
+            continue
+        if result.get("skipped"):
+            _proxies["skipped"] += 1
+            continue
+        _proxies["written"] += 1
+        target = result["target"]
+        stat_cache.invalidate(target)
+        catalog_index.invalidate(target)
+        variant_index.invalidate(naming_rules().classify(target)[0])
+        if conn:
+            try:
+                manifest.store_proxy(conn, path, target, tuple(result["signature"]), _proxies["settings"])
+            except (sqlite3.Error, OSError):
+                pass
+    # new proxy files can turn a hi-res row switchable; counters are drawn directly
+    if _proxies["written"] != written:
+        tag_panel_rows()
+    tag_redraw_viewports()
+    if pool.finished:
+        pool.shutdown()
+        _proxies["pool"] = None
+        parts = [f"{_proxies['written']} written", f"{_proxies['skipped']} up to date"]
+        if _proxies["kept"]:
+            parts.append(f"{_proxies['kept']} existing kept")
+        errors = _proxies["errors"]
+        if errors:
+            parts.append(f"{len(errors)} failed ({errors[0]})")
+        _proxies["summary"] = ", ".join(parts)
+        tag_redraw_viewports()
+        return None
+    return 0.5
+
+def proxy_progress():
+    """(done, total) of the running proxy generation, or None."""
+    pool = _proxies["pool"]
+    return (pool.done, pool.total) if pool else None
+
+# #### Pre-warm queue
+# With the preference enabled, low-res libraries flagged for hi-res render get
+# their hi-res datablocks linked hidden from a timer, one library per tick, so
+# render_init only has to remap users instead of reloading files.
+_prewarm_queue = []
+
+def addon_prefs():
+    """This add-on's AddonPreferences, or None when not registered."""
+    addon = bpy.context.preferences.addons.get(__name__)
+    return addon.preferences if addon else None
+
+def _run_prewarm():
+    while _prewarm_queue:
+        lo_fp = _prewarm_queue.pop(0)
+        rs = resolution_status.get(lo_fp, {})
+        if rs.get("status") != "low" or not rs.get("high_res_for_render"):
+            continue
+        if prewarmed_library(rs.get("high_path")) or not find_library(lo_fp):
+            continue
+        load_highres_hidden(lo_fp)
+        return 0.1 if _prewarm_queue else None
+    return None
+
+def schedule_prewarm(lo_fp=None):
+    """Queue lo_fp (or every flagged low-res library) for hidden hi-res linking."""
+    prefs = addon_prefs()
+    if not prefs or not prefs.prewarm_hi_res:
+        return
+    if lo_fp is None:
+        targets = [fp for fp, rs in resolution_status.items()
+                   if rs.get("status") == "low" and rs.get("high_res_for_render")]
+    else:
+        targets = [lo_fp]
+    for fp in targets:
+        if fp not in _prewarm_queue:
+            _prewarm_queue.append(fp)
+    if _prewarm_queue and not bpy.app.timers.is_registered(_run_prewarm):
+        bpy.app.timers.register(_run_prewarm, first_interval=0.1)
+
 @persistent
 def linkeditor_load_post(dummy):
-    """Clear all cached link-editor state when a new .blend is loaded."""
+    """Reset the link-editor state when a .blend is loaded, then restore what it saved."""
+    if _loader["job"] is not None:
+        _loader["job"][2].close()
     library_order.clear()
     expanded_states.clear()
+    selected_libraries.clear()
     link_active_states.clear()
     linked_elements.clear()
     resolution_status.clear()
     ephemerally_loaded_libraries.clear()
     ephemeral_hidden_libraries.clear()
+    library_stamps.clear()
+    stale_libraries.clear()
+    unloaded_parts.clear()
+    library_last_used.clear()
+    invalidate_footprints()
     _RENDER_SWAPS.clear()
-
-@persistent
-def monitor_libraries(dummy):
-    """Update linked_elements with options for newly linked libraries."""
+    _RENDER_REMAPS.clear()
+    _RENDER_PINS.clear()
+    _prewarm_queue.clear()
+    _loader["queue"].clear()
+    _loader.update(job=None, done=0, total=0, fraction=0.0, errors=[])
+    if bpy.app.timers.is_registered(_run_loader):
+        bpy.app.timers.unregister(_run_loader)
+    _render_job["active"] = False
+    invalidate_library_index()
+    clear_path_caches()
+    _monitor_state["count"] = -1
+    _monitor_state["generation"] = None
+    restore_state()
+    prefetch_library_stats(library_order)
+    schedule_prewarm()
+    tag_panel_rows()
+    schedule_library_monitor()
+    if bpy.context.scene:
+        update_live_lod(bpy.context.scene.link_manager, bpy.context)
+    prefs = addon_prefs()
+    if prefs:
+        update_library_watch(prefs, bpy.context)
+        stat_cache.ttl = prefs.stat_ttl
+        if prefs.variant_rules != variant_index.rules.source:
+            variant_index.set_rules(variants.NamingRules.parse(prefs.variant_rules))
+
+# ### Change Tracking
+# Each library's file stamp (size, mtime and, if enabled, a sampled content
+# hash) is recorded when it is linked. "Reload Changed" compares against it,
+# and an optional watcher (inotify on Linux, polling elsewhere) flags stale
+# libraries in the panel.
+library_stamps = {}
+stale_libraries = set()
+_watch = {"watcher": None, "pending": set()}  # pending: fps with events whose stat is not refreshed yet
+
+def _use_stamp_hash():
+    prefs = addon_prefs()
+    return bool(prefs and prefs.stamp_hash)
+
+def record_library_stamp(fp):
+    """Remember the current file stamp of fp."""
+    stat_cache.invalidate(library_abspath(fp))
+    try:
+        library_stamps[fp] = manifest.file_signature(library_abspath(fp), with_hash=_use_stamp_hash())
+    except OSError:
+        library_stamps.pop(fp, None)
+    stale_libraries.discard(fp)
+
+def library_changed(fp):
+    """True if fp's file differs from the stamp recorded when it was linked."""
+    stamp = library_stamps.get(fp)
+    if stamp is None:
+        return False
+    abs_fp = library_abspath(fp)
+    known, st = stat_cache.lookup(abs_fp)
+    if not known:
+        return fp in stale_libraries
+    if st is None:
+        return True
+    if (st.st_size, st.st_mtime_ns) == stamp[:2]:
+        return False
+    if st.st_size == stamp[0] and stamp[2] is not None:
+        try:
+            if manifest.quick_hash(abs_fp, st.st_size) == stamp[2]:
+                library_stamps[fp] = (st.st_size, st.st_mtime_ns, stamp[2])
+                return False
+        except OSError:
+            pass
+    return True
+
+def update_stale_libraries(fps):
+    """Re-check fps against their stamps. Returns True if the stale set changed."""
+    before = set(stale_libraries)
+    for fp in fps:
+        if library_changed(fp):
+            stale_libraries.add(fp)
+        else:
+            stale_libraries.discard(fp)
+    return stale_libraries != before
+
+def stop_library_watch():
+    if bpy.app.timers.is_registered(_run_library_watch):
+        bpy.app.timers.unregister(_run_library_watch)
+    if _watch["watcher"] is not None:
+        _watch["watcher"].close()
+        _watch["watcher"] = None
+    _watch["pending"].clear()
+
+def _run_library_watch():
+    prefs = addon_prefs()
+    if not prefs or not prefs.watch_libraries:
+        stop_library_watch()
+        return None
+    watcher = _watch["watcher"]
+    if watcher is None:
+        watcher = _watch["watcher"] = filewatch.create_watcher()
+    tracked = {library_abspath(fp): fp for fp in library_stamps}
+    if watcher is not None:
+        # writes from other hosts never reach inotify; those files are re-stat'ed
+        # in the background on every tick and compared once the result lands
+        remote = filewatch.network_paths(tracked)
+        watcher.watch(set(tracked) - remote)
+        stat_cache.prefetch(remote, max_age=0)
+        pending = {fp for fp in _watch["pending"] if fp in library_stamps}
+        for path in watcher.poll():
+            if path in tracked:
+                stat_cache.invalidate(path)
+                pending.add(tracked[path])
+        stat_cache.prefetch(library_abspath(fp) for fp in pending)
+        candidates = list(pending) + [tracked[path] for path in remote]
+        # an event is only settled once the refreshed stat has landed; re-check the rest next tick
+        _watch["pending"] = {fp for fp in pending if not stat_cache.lookup(library_abspath(fp))[0]}
+    else:
+        candidates = list(tracked.values())
+    if update_stale_libraries(candidates):
+        tag_panel_rows()
+        tag_redraw_viewports()
+    return prefs.watch_interval
+
+def update_library_watch(self, context):
+    if self.watch_libraries:
+        if not bpy.app.timers.is_registered(_run_library_watch):
+            bpy.app.timers.register(_run_library_watch, first_interval=self.watch_interval)
+    else:
+        stop_library_watch()
+
+# ### Memory Budget
+# Footprints are estimated from mesh element counts and the pixel counts of
+# images that are actually loaded, gathered in one pass over bpy.data per
+# change. With a budget set, least-recently-used libraries are switched to
+# low-res and then unloaded until the estimate fits.
+BYTES_PER_VERTEX = 32  # position, normal, flags
+BYTES_PER_EDGE = 12
+BYTES_PER_LOOP = 16  # vertex and edge index, custom normal
+BYTES_PER_FACE = 16
+BYTES_PER_UV = 8
+_footprints = {"key": None, "epoch": 0, "bytes": {}}
+library_last_used = {}
+
+def invalidate_footprints():
+    _footprints["epoch"] += 1
+
+def library_footprints():
+    """{library pointer: estimated bytes} for every library."""
+    data = bpy.data
+    key = (library_generation(), len(data.meshes), len(data.images), _footprints["epoch"])
+    if key == _footprints["key"]:
+        return _footprints["bytes"]
+    sizes = {}
+    for mesh in data.meshes:
+        lib = mesh.library
+        if lib is None:
+            continue
+        loops = len(mesh.loops)
+        size = (len(mesh.vertices) * BYTES_PER_VERTEX + len(mesh.edges) * BYTES_PER_EDGE
+                + loops * (BYTES_PER_LOOP + BYTES_PER_UV * len(mesh.uv_layers))
+                + len(mesh.polygons) * BYTES_PER_FACE)
+        ptr = lib.as_pointer()
+        sizes[ptr] = sizes.get(ptr, 0) + size
+    for image in data.images:
+        lib = image.library
+        if lib is None or not image.has_data:
+            continue
+        width, height = image.size
+        size = width * height * image.channels * (4 if image.is_float else 1)
+        ptr = lib.as_pointer()
+        sizes[ptr] = sizes.get(ptr, 0) + size
+    _footprints["bytes"] = sizes
+    _footprints["key"] = key
+    return sizes
+
+def library_footprint(fp):
+    """Estimated bytes held by the loaded library at fp (0 if not loaded)."""
+    lib = find_library(fp)
+    return library_footprints().get(lib.as_pointer(), 0) if lib else 0
+
+def memory_usage():
+    return sum(library_footprints().values())
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def touch_library(fp):
+    """Mark fp as just used for least-recently-used eviction."""
+    library_last_used[fp] = time.monotonic()
+
+def memory_budget():
+    """Budget in bytes, or 0 when none is set."""
+    prefs = addon_prefs()
+    return prefs.memory_budget * 1024 * 1024 if prefs else 0
+
+def enforce_memory_budget(context):
+    """Switch to low-res, then unload, least-recently-used libraries until usage fits the budget.
+
+    Returns the list of (filepath, action) taken.
+    """
+    budget = memory_budget()
+    if not budget or memory_usage() <= budget:
+        return []
+    policy = addon_prefs().budget_action
+    taken = []
+    passes = [p for p in ('LOW_RES', 'UNLOAD') if policy in (p, 'BOTH')]
+    for step in passes:
+        loaded = [r["filepath"] for r in get_panel_rows() if find_library(r["filepath"])]
+        for fp in sorted(loaded, key=lambda f: library_last_used.get(f, 0.0)):
+            if memory_usage() <= budget:
+                return taken
+            if library_loading(fp):
+                continue
+            if step == 'LOW_RES':
+                if is_low_res(fp):
+                    continue
+                tgt = resolution_target(fp)
+                if not library_exists(tgt):
+                    continue
+                ok, _ = switch_library_resolution(context, fp, normalize_filepath(tgt))
+                # the Library pointer is reused, so the row model would keep the old path
+                tag_panel_rows()
+            else:
+                ok, _ = unload_library(context, fp)
+            if ok:
+                taken.append((fp, step))
+    return taken
+
+def _run_budget_check():
+    taken = enforce_memory_budget(bpy.context)
+    if taken:
+        switched = sum(step == 'LOW_RES' for _, step in taken)
+        unloaded = len(taken) - switched
+        parts = [f"{n} {verb}" for n, verb in ((switched, "switched to low-res"), (unloaded, "unloaded")) if n]
+        set_status(f"Memory budget: {', '.join(parts)}", 'WARNING')
+        # a timer has no view layer to update; the switches already tagged their rows
+        tag_panel_rows()
+        tag_redraw_viewports()
+    return None
+
+def schedule_budget_check(self=None, context=None):
+    """Check the memory budget shortly, once pending library changes have settled."""
+    if memory_budget() and not bpy.app.timers.is_registered(_run_budget_check):
+        bpy.app.timers.register(_run_budget_check, first_interval=0.5)
+
+# ### Library Monitor
+# depsgraph_update_post fires on every edit; only a change in the set of
+# libraries schedules a capture, and bursts are coalesced by a debounce timer.
+MONITOR_DEBOUNCE = 0.25
+_monitor_state = {"count": -1, "generation": None}
+
+def library_generation():
+    """Fingerprint of the library set: count plus every Library pointer."""
+    libs = bpy.data.libraries
+    return (len(libs), tuple(l.as_pointer() for l in libs))
+
+def _flush_library_monitor():
+    """Timer callback: capture newly linked libraries once the burst settles."""
+    generation = library_generation()
+    _monitor_state["count"] = generation[0]
+    if generation == _monitor_state["generation"]:
+        return None
+    _monitor_state["generation"] = generation
+    invalidate_library_index()
+    tag_panel_rows()
     for lib in bpy.data.libraries:
         fp = normalize_filepath(lib.filepath)
         if fp not in linked_elements:
             linked_elements[fp] = get_linked_item_names(lib)
+        if fp not in library_stamps:
+            record_library_stamp(fp)
+    prefetch_library_stats(normalize_filepath(lib.filepath) for lib in bpy.data.libraries)
+    schedule_budget_check()
+    return None
+
+def schedule_library_monitor():
+    """(Re)start the debounce window for a library capture."""
+    if bpy.app.timers.is_registered(_flush_library_monitor):
+        bpy.app.timers.unregister(_flush_library_monitor)
+    bpy.app.timers.register(_flush_library_monitor, first_interval=MONITOR_DEBOUNCE)
+
+@persistent
+def linkeditor_save_post(dummy):
+    """Relative paths depend on the .blend location, so drop memoized paths on save."""
+    clear_path_caches()
+    tag_panel_rows()
+
+@persistent
+def monitor_libraries(scene, depsgraph=None):
+    """Schedule a capture only when the set of libraries changed."""
+    if depsgraph is not None and (depsgraph.id_type_updated('OBJECT')
+                                  or depsgraph.id_type_updated('COLLECTION')):
+        invalidate_library_index()
+    obj = getattr(bpy.context, "active_object", None)
+    if obj is not None:
+        lib = safe_library(obj.instance_collection) if obj.instance_collection else safe_library(obj)
+        if lib:
+            touch_library(normalize_filepath(lib.filepath))
+    changed = len(bpy.data.libraries) != _monitor_state["count"]
+    if not changed and depsgraph is not None:
+        changed = depsgraph.id_type_updated('LIBRARY')
+    if changed:
+        invalidate_library_paths()
+        _monitor_state["count"] = len(bpy.data.libraries)
+        schedule_library_monitor()
+
+# ### Saved State
+# The module-level state is written into scene.link_manager.libraries before
+# every save and read back on load. Libraries that were unloaded are not in
+# the saved file at all, so they stay deferred on open; what is needed to
+# link them again (and any unloaded parts) comes from the saved entries.
+def _encode_snapshot(snapshot):
+    matrices = np.ascontiguousarray(snapshot["matrices"], dtype=np.float32)
+    return dict(snapshot, matrices=base64.b64encode(matrices.tobytes()).decode("ascii"))
+
+def _decode_snapshot(data):
+    matrices = np.frombuffer(base64.b64decode(data["matrices"]), dtype=np.float32).reshape(-1, 16)
+    return dict(data, matrices=matrices.copy())
+
+def encode_items(items):
+    """JSON text for a linked_elements entry."""
+    if items.get('transforms') is not None:
+        items = dict(items, transforms=_encode_snapshot(items['transforms']))
+    return json.dumps(items)
+
+def decode_items(text):
+    items = json.loads(text)
+    if items.get('transforms') is not None:
+        items['transforms'] = _decode_snapshot(items['transforms'])
+    return items
+
+def encode_parts(parts):
+    """JSON text for an unloaded_parts entry."""
+    out = {"collections": {}, "objects": dict(parts.get("objects", {}))}
+    for name, part in parts.get("collections", {}).items():
+        out["collections"][name] = dict(part, transforms=_encode_snapshot(part["transforms"]))
+    return json.dumps(out)
+
+def decode_parts(text):
+    parts = json.loads(text)
+    for part in parts.get("collections", {}).values():
+        part["transforms"] = _decode_snapshot(part["transforms"])
+    return parts
+
+class LINKEDITOR_PG_library_state(bpy.types.PropertyGroup):
+    """Saved Link Manager state of one library."""
+    filepath: StringProperty(subtype='FILE_PATH')
+    listed: bpy.props.BoolProperty(default=True)
+    loaded: bpy.props.BoolProperty(default=True)
+    expanded: bpy.props.BoolProperty()
+    selected: bpy.props.BoolProperty()
+    hidden: bpy.props.BoolProperty()
+    status: StringProperty()
+    high_path: StringProperty(subtype='FILE_PATH')
+    low_path: StringProperty(subtype='FILE_PATH')
+    high_res_for_render: bpy.props.BoolProperty()
+    elements: StringProperty()
+    parts: StringProperty()
+
+def store_state(scene):
+    """Write the library state into scene.link_manager.libraries."""
+    saved = scene.link_manager.libraries
+    saved.clear()
+    fps = dict.fromkeys([*library_order, *link_active_states, *resolution_status,
+                         *unloaded_parts, *ephemeral_hidden_libraries])
+    for fp in fps:
+        rs = resolution_status.get(fp, {})
+        loaded = find_library(fp) is not None
+        item = saved.add()
+        item.filepath = library_abspath(fp)
+        item.listed = fp in library_order
+        item.loaded = loaded
+        item.expanded = expanded_states.get(fp, False)
+        item.selected = fp in selected_libraries
+        item.hidden = fp in ephemeral_hidden_libraries
+        if rs:
+            item.status = rs["status"]
+            item.high_path = library_abspath(rs["high_path"])
+            item.low_path = library_abspath(rs["low_path"])
+            item.high_res_for_render = rs.get("high_res_for_render", False)
+        if not loaded and linked_elements.get(fp):
+            item.elements = encode_items(linked_elements[fp])
+        if unloaded_parts.get(fp):
+            item.parts = encode_parts(unloaded_parts[fp])
+
+def restore_state():
+    """Fill the module-level state from the first scene that has saved state."""
+    scenes = [bpy.context.scene, *bpy.data.scenes] if bpy.context.scene else list(bpy.data.scenes)
+    scene = next((s for s in scenes if len(s.link_manager.libraries)), None)
+    if scene is None:
+        return
+    failed = []
+    for item in scene.link_manager.libraries:
+        fp = normalize_filepath(item.filepath)
+        lib = find_library(fp)
+        loaded = lib is not None
+        if item.listed:
+            library_order.append(fp)
+        if item.expanded:
+            expanded_states[fp] = True
+        if item.selected:
+            selected_libraries.add(fp)
+        if item.hidden and loaded:
+            # both sets, or prewarmed_library()/release_prewarmed() no longer manage it
+            ephemeral_hidden_libraries.add(fp)
+            ephemerally_loaded_libraries.add(lib)
+        if item.status:
+            resolution_status[fp] = {
+                "status": item.status,
+                "high_path": normalize_filepath(item.high_path),
+                "low_path": normalize_filepath(item.low_path),
+                "high_res_for_render": item.high_res_for_render,
+            }
+        if loaded or item.loaded or item.elements:
+            link_active_states[fp] = loaded
+        try:
+            if not loaded and item.elements:
+                linked_elements[fp] = decode_items(item.elements)
+            if item.parts:
+                unloaded_parts[fp] = decode_parts(item.parts)
+        except (ValueError, KeyError, TypeError) as e:
+            failed.append(f"{os.path.basename(fp)}: {e}")
+    report_errors("Could not restore saved state", failed)
+
+@persistent
+def linkeditor_save_pre(dummy):
+    """Store the library state in the scene so it survives save and reopen."""
+    if bpy.context.scene:
+        store_state(bpy.context.scene)
+
+# ### Level of Detail
+# Per-instance lo/hi choice for collection-instance empties, driven by the
+# active camera: distance, projected screen size and frustum culling. Used at
+# render_init for libraries flagged for hi-res render, and optionally live in
+# the viewport from a timer.
+LOD_LIVE_INTERVAL = 0.5
+
+def collection_bounds(coll, cache):
+    """Local-space (min, max) corners of everything in coll, relative to its instance offset."""
+    key = coll.as_pointer()
+    if key in cache:
+        return cache[key]
+    lo = Vector((float("inf"),) * 3)
+    hi = Vector((float("-inf"),) * 3)
+    for obj in coll.all_objects:
+        for corner in obj.bound_box:
+            co = obj.matrix_world @ Vector(corner)
+            lo = Vector(map(min, lo, co))
+            hi = Vector(map(max, hi, co))
+    bounds = None
+    if lo.x <= hi.x:
+        offset = coll.instance_offset
+        bounds = (lo - offset, hi - offset)
+    cache[key] = bounds
+    return bounds
+
+def instance_wants_hi_res(scene, camera, settings, empty, bounds):
+    """Decide whether one instance empty should show the hi-res collection."""
+    if bounds is None:
+        return False
+    lo, hi = bounds
+    mw = empty.matrix_world
+    corners = [mw @ Vector((x, y, z)) for x in (lo.x, hi.x) for y in (lo.y, hi.y) for z in (lo.z, hi.z)]
+    projected = [world_to_camera_view(scene, camera, co) for co in corners]
+
+    if settings.lod_frustum_cull:
+        if (all(p.z < 0 for p in projected) or all(p.x < 0 for p in projected) or all(p.x > 1 for p in projected)
+                or all(p.y < 0 for p in projected) or all(p.y > 1 for p in projected)):
+            return False
+
+    if settings.lod_mode == 'DISTANCE':
+        center = sum(corners, Vector()) / len(corners)
+        radius = max((c - center).length for c in corners)
+        return (center - camera.matrix_world.translation).length - radius <= settings.lod_distance
+
+    if any(p.z <= 0 for p in projected):
+        return True  # straddles the camera plane, treat as close
+    xs = [min(max(p.x, 0.0), 1.0) for p in projected]
+    ys = [min(max(p.y, 0.0), 1.0) for p in projected]
+    return max(max(xs) - min(xs), max(ys) - min(ys)) >= settings.lod_screen_size
+
+def apply_lod(scene, lo_fp, journal=None):
+    """Retarget the instances of one low-res library per LOD rules. Returns the number switched."""
+    settings = scene.link_manager
+    camera = scene.camera
+    rs = resolution_status.get(lo_fp, {})
+    lo_lib = find_library(lo_fp)
+    if settings.lod_mode == 'OFF' or not camera or not lo_lib or rs.get("status") != "low":
+        return 0
+
+    cache = {}
+    lo_empties = library_instancers(lo_lib)
+    hi_lib = prewarmed_library(rs.get("high_path"))
+    hi_empties = library_instancers(hi_lib) if hi_lib else []
+    wanted = {datablock_base(o.instance_collection.name) for o in lo_empties
+              if instance_wants_hi_res(scene, camera, settings, o, collection_bounds(o.instance_collection, cache))}
+    # only link what is not there yet; this runs on every live LOD tick
+    missing = wanted - {datablock_base(c.name) for c in library_entry(hi_lib)["collections"]} if hi_lib else wanted
+    if missing and load_highres_hidden(lo_fp, only=missing):
+        hi_lib = prewarmed_library(rs.get("high_path"))
+    if not hi_lib:
+        return 0
+
+    if journal is not None:
+        journal.extend((o, o.instance_collection) for o in lo_empties + hi_empties)
+    lo_to_hi, hi_to_lo = instance_collection_maps(lo_lib, hi_lib)
+    to_hi, to_lo = [], []
+    for obj in lo_empties:
+        if datablock_base(obj.instance_collection.name) in wanted:
+            to_hi.append(obj)
+    for obj in hi_empties:
+        lo_coll = hi_to_lo.get(obj.instance_collection.as_pointer())
+        if lo_coll and not instance_wants_hi_res(scene, camera, settings, obj, collection_bounds(lo_coll, cache)):
+            to_lo.append(obj)
+    return retarget_instances(to_hi, lo_to_hi) + retarget_instances(to_lo, hi_to_lo)
+
+def _run_live_lod():
+    scene = bpy.context.scene
+    if not scene or not scene.link_manager.lod_live or scene.link_manager.lod_mode == 'OFF':
+        return None
+    changed = 0
+    for fp, rs in list(resolution_status.items()):
+        if rs.get("status") == "low" and rs.get("high_res_for_render"):
+            changed += apply_lod(scene, fp)
+    if changed:
+        force_viewport_refresh(rows=False)
+    return LOD_LIVE_INTERVAL
+
+def update_live_lod(self, context):
+    if self.lod_live and self.lod_mode != 'OFF':
+        if not bpy.app.timers.is_registered(_run_live_lod):
+            bpy.app.timers.register(_run_live_lod, first_interval=LOD_LIVE_INTERVAL)
+    elif bpy.app.timers.is_registered(_run_live_lod):
+        bpy.app.timers.unregister(_run_live_lod)
+
+class LINKEDITOR_PG_settings(bpy.types.PropertyGroup):
+    lod_mode: bpy.props.EnumProperty(
+        name="Level of Detail",
+        description="How libraries flagged for hi-res render choose hi-res per instance",
+        items=[
+            ('OFF', "Off", "Swap the whole library to hi-res at render time"),
+            ('DISTANCE', "Distance", "Hi-res for instances closer to the camera than a distance"),
+            ('SCREEN_SIZE', "Screen Size", "Hi-res for instances covering enough of the frame"),
+        ],
+        default='OFF',
+        update=update_live_lod)
+    lod_distance: bpy.props.FloatProperty(
+        name="Distance", description="Instances closer than this use hi-res",
+        default=25.0, min=0.0, subtype='DISTANCE', unit='LENGTH')
+    lod_screen_size: bpy.props.FloatProperty(
+        name="Screen Size", description="Fraction of the frame an instance must cover to use hi-res",
+        default=0.1, min=0.0, max=1.0, subtype='FACTOR')
+    lod_frustum_cull: bpy.props.BoolProperty(
+        name="Frustum Culling", description="Instances outside the camera view stay low-res",
+        default=True)
+    lod_live: bpy.props.BoolProperty(
+        name="Live in Viewport", description="Keep updating the per-instance choice while you work",
+        default=False, update=update_live_lod)
+    libraries: bpy.props.CollectionProperty(type=LINKEDITOR_PG_library_state)
 
 # ### Render-Time Swapping
+# Swaps are tied to the render job (render_init -> render_complete/cancel),
+# not to each frame. _RENDER_SWAPS is the restore journal: Library pointer ->
+# filepath before the swap.
+_render_job = {"active": False}
+_RENDER_REMAPS = []
+_RENDER_PINS = []
+
 @persistent
-def prepare_render(scene, _):
-    for fp, rs in resolution_status.items():
+def prepare_render(scene, _=None):
+    """Swap low-res libraries flagged for hi-res render once per render job."""
+    if _render_job["active"]:
+        return
+    _render_job["active"] = True
+    for fp, rs in list(resolution_status.items()):
         if rs.get("status") != "low" or not rs.get("high_res_for_render"):
             continue
         hi_fp = rs["high_path"]
-        lib = next((l for l in bpy.data.libraries if normalize_filepath(l.filepath) == fp), None)
+        lib = find_library(fp)
         if not lib or normalize_filepath(lib.filepath) == hi_fp:
             continue
-        _RENDER_SWAPS[id(lib)] = lib.filepath
-        lib.filepath = hi_fp
+        pinned = set()
+        instancers = library_instancers(lib)
+        if scene.link_manager.lod_mode != 'OFF' and scene.camera and instancers:
+            # LOD picks a resolution per instance for these collections and their meshes
+            for obj in instancers:
+                coll = obj.instance_collection
+                pinned.add(coll.as_pointer())
+                pinned.update(o.data.as_pointer() for o in coll.all_objects if o.data)
+            apply_lod(scene, fp, journal=_RENDER_PINS)
+        hi_lib = prewarmed_library(hi_fp)
+        if hi_lib:
+            if not pinned:
+                # instances already switched to hi-res by hand must stay there after restore
+                _RENDER_PINS.extend((obj, obj.instance_collection) for obj in library_instancers(hi_lib))
+            # everything LOD did not pin is swapped whole, datablock by datablock
+            pairs = [(lo_id, hi_id) for lo_id, hi_id in lo_hi_pairs(lib, hi_lib)
+                     if lo_id.as_pointer() not in pinned]
+            for lo_id, hi_id in pairs:
+                lo_id.user_remap(hi_id)
+            _RENDER_REMAPS.extend(pairs)
+            if pairs or pinned:
+                continue
+        _RENDER_SWAPS[lib.as_pointer()] = lib.filepath
+        set_library_filepath(lib, hi_fp)
         reload_library(lib)
-    bpy.context.view_layer.update()
+    if _RENDER_SWAPS or _RENDER_REMAPS or _RENDER_PINS:
+        invalidate_library_index()
+        bpy.context.view_layer.update()
 
 @persistent
-def restore_render(scene, _):
+def restore_render(scene, _=None):
+    """Put every journaled library back on its low-res file, even after a cancel."""
+    _render_job["active"] = False
+    if not _RENDER_SWAPS and not _RENDER_REMAPS and not _RENDER_PINS:
+        return
+    for lo_id, hi_id in reversed(_RENDER_REMAPS):
+        try:
+            hi_id.user_remap(lo_id)
+        except ReferenceError:
+            pass
+    _RENDER_REMAPS.clear()
+    for obj, coll in _RENDER_PINS:
+        try:
+            obj.instance_collection = coll
+        except ReferenceError:
+            pass
+    _RENDER_PINS.clear()
+    invalidate_library_index()
     for lib in bpy.data.libraries:
-        orig_low = _RENDER_SWAPS.pop(id(lib), None)
-        if not orig_low or normalize_filepath(lib.filepath) == orig_low:
+        orig_low = _RENDER_SWAPS.pop(lib.as_pointer(), None)
+        if not orig_low or normalize_filepath(lib.filepath) == normalize_filepath(orig_low):
             continue
-        lib.filepath = orig_low
+        set_library_filepath(lib, orig_low)
         reload_library(lib)
+    _RENDER_SWAPS.clear()
+    invalidate_library_index()
     bpy.context.view_layer.update()
     force_viewport_refresh()
 
+# ### Library Dependencies
+# Indirect libraries (linked through another library) have Library.parent
+# set; that parent chain is the tree shown in the panel. For ordering work,
+# the libraries each file links from (read from its catalog) are added too,
+# so a library that is shared, or also linked directly, still comes before
+# every library that depends on it.
+_library_tree = {"key": None, "parents": {}}
+
+def library_parents():
+    """{fp: parent fp} for every indirect library."""
+    key = library_generation()
+    if key != _library_tree["key"]:
+        parents = {}
+        for lib in bpy.data.libraries:
+            parent = lib.parent
+            if parent is not None:
+                parents[normalize_filepath(lib.filepath)] = normalize_filepath(parent.filepath)
+        _library_tree["parents"] = parents
+        _library_tree["key"] = key
+    return _library_tree["parents"]
+
+def library_parent(fp):
+    """Path of the library fp is linked through, or None for a direct library."""
+    return library_parents().get(fp)
+
+def library_dependencies(fps):
+    """{fp: set of fps it links from}, limited to fps."""
+    wanted = set(fps)
+    deps = {fp: set() for fp in wanted}
+    for child, parent in library_parents().items():
+        if child in wanted and parent in wanted:
+            deps[parent].add(child)
+    for fp in wanted:
+        folder = os.path.dirname(library_abspath(fp))
+        for path in library_catalog(fp).get("libraries", []):
+            if path.startswith("//"):
+                path = os.path.join(folder, path[2:])
+            dep = normalize_filepath(path)
+            if dep in wanted and dep != fp:
+                deps[fp].add(dep)
+    return deps
+
+def topological_order(fps):
+    """fps with every library after the libraries it links from, each once."""
+    deps = library_dependencies(fps)
+    order, state = [], {}
+    for root in dict.fromkeys(fps):
+        if root in state:
+            continue
+        stack = [(root, iter(sorted(deps[root])))]
+        state[root] = "visiting"
+        while stack:
+            fp, pending = stack[-1]
+            dep = next(pending, None)
+            if dep is None:
+                stack.pop()
+                state[fp] = "done"
+                order.append(fp)
+            elif dep not in state:  # cycles are broken where they are found
+                state[dep] = "visiting"
+                stack.append((dep, iter(sorted(deps[dep]))))
+    return order
+
+def reload_indirect_library(fp):
+    """Reload an indirect library in place; it cannot be unloaded on its own."""
+    lib = find_library(fp)
+    if not lib:
+        return False, "Library not found"
+    reload_library(lib)
+    invalidate_library_index()
+    record_library_stamp(fp)
+    touch_library(fp)
+    return True, f"Reloaded: {os.path.basename(fp)}"
+
+# ### Library Actions
+# Operator bodies live here so single-library and batch operators share them.
+# Actions return (ok, message) and never refresh the viewport; callers refresh
+# once when they are done.
+ITEM_META_KEYS = ('options', 'collection_instances', 'type', 'transforms')
+
+def unload_library(context, fp):
+    """Remove a loaded library, remembering what it provided in linked_elements."""
+    lib = find_library(fp)
+    if not lib:
+        return False, "Library not found"
+    if lib.parent:
+        return False, f"Linked through {os.path.basename(lib.parent.filepath)}; unload that library instead"
+    linked_elements[fp] = get_linked_item_names(lib)
+    if linked_elements[fp].get('type') == 'collections':
+        remove_library_instancers(lib, set(linked_elements[fp]['collections']))
+    bpy.data.libraries.remove(lib)
+    invalidate_library_index()
+    release_prewarmed(resolution_status.get(fp, {}).get("high_path"))
+    link_active_states[fp] = False
+    return True, f"Unloaded: {os.path.basename(fp)}"
+
+RESTORE_CHUNK = 256  # instance empties recreated between progress yields
+
+def restore_library(context, fp, fresh_names=False):
+    """Link fp's recorded items and recreate its instance empties.
+
+    A generator yielding the fraction done after the link and after every
+    RESTORE_CHUNK empties, so it can be exhausted at once or stepped from a
+    timer. With fresh_names, empties get unused names and follow the
+    instance_collections option; otherwise the recorded names are reused.
+    """
+    items = linked_elements[fp]
+    options = items.get('options', {})
+    catalog = library_catalog(fp)
+    with bpy.data.libraries.load(fp, link=True) as (src, dst):
+        for dt, names in items.items():
+            if dt not in ITEM_META_KEYS:
+                setattr(dst, dt, linkable_names(src, dt, names, catalog))
+    invalidate_library_index()
+
+    try:
+        active_col = active_collection(context)
+        lib = find_library(fp)
+        if lib and fresh_names:
+            remove_library_instancers(lib, None)
+        entry = library_entry(lib) if lib else _new_index_entry()
+
+        if items['type'] != 'collections':
+            lib_objects = {o.name: o for o in entry["objects"]}
+            for obj_name in items.get('objects', []):
+                obj = lib_objects.get(obj_name)
+                if obj:
+                    active_col.objects.link(obj)
+            return
+
+        snapshot = items.get('transforms') or empty_snapshot()
+        if not fresh_names:
+            pending = list(range(len(snapshot["names"])))
+        elif options.get('instance_collections'):
+            snapshot = {k: v.copy() for k, v in snapshot.items()}
+            wanted = set(items['collections'])
+            pending = [i for i, c in enumerate(snapshot["collections"]) if c in wanted]
+            captured = {snapshot["collections"][i] for i in pending}
+            pending += [add_snapshot_row(snapshot, f"{c}_instance", c)
+                        for c in items['collections'] if c not in captured]
+        else:
+            pending = []
+        yield 1 / (len(pending) + 1)
+
+        lib_collections = {c.name: c for c in entry["collections"]}
+        names = UniqueNames() if fresh_names else None
+        made = {}
+        for start in range(0, len(pending), RESTORE_CHUNK):
+            create_instance_empties(snapshot, pending[start:start + RESTORE_CHUNK], lib_collections,
+                                    active_col, names, made)
+            yield (min(start + RESTORE_CHUNK, len(pending)) + 1) / (len(pending) + 1)
+    finally:
+        # also runs when a streamed load is cancelled part way
+        invalidate_library_index()
+        lib = find_library(fp)
+        if lib and options.get('relative_path'):
+            try:
+                set_library_filepath(lib, bpy.path.relpath(bpy.path.abspath(fp)))
+            except ValueError:
+                pass
+        link_active_states[fp] = lib is not None
+        record_library_stamp(fp)
+        invalidate_footprints()
+        touch_library(fp)
+
+def relink_library(context, fp):
+    """Re-link a previously unloaded library and recreate its instance empties."""
+    if fp not in linked_elements:
+        return False, "No library to unload or reload"
+    for _ in restore_library(context, fp, fresh_names=True):
+        pass
+    schedule_prewarm(fp)
+    return True, f"Reloaded: {os.path.basename(fp)}"
+
+def toggle_library(context, fp):
+    """Unload fp if it is loaded, otherwise re-link it."""
+    if find_library(fp):
+        return unload_library(context, fp)
+    return relink_library(context, fp)
+
+def prepare_reload(context, fp):
+    """Unload fp if it is loaded so restore_library can link it again."""
+    lib = find_library(fp)
+    if lib:
+        linked_elements[fp] = get_linked_item_names(lib)
+        if linked_elements[fp]['type'] == 'collections':
+            remove_library_instancers(lib, set(linked_elements[fp]['collections']))
+        bpy.data.libraries.remove(lib)
+        invalidate_library_index()
+    if not linked_elements.get(fp):
+        return False, "No items found to reload"
+    return True, ""
+
+def reload_linked_library(context, fp):
+    """Reload a linked .blend, preserving only the previously visible items."""
+    if library_parent(fp):
+        return reload_indirect_library(fp)
+    ok, msg = prepare_reload(context, fp)
+    if not ok:
+        return ok, msg
+    for _ in restore_library(context, fp):
+        pass
+    return True, f"Reloaded: {os.path.basename(fp)}"
+
+# #### Partial loading
+# Single collections (or, for libraries linked as loose objects, single
+# objects) can be unloaded while the rest of the library stays linked. What
+# was removed is kept in unloaded_parts, with the local collections it was
+# linked into and a snapshot of its instance empties, so it can be linked
+# back on its own. Captures of the library only list the parts still loaded,
+# so full unload/reload cycles leave unloaded parts unloaded.
+unloaded_parts = {}  # fp -> {"collections": {name: part}, "objects": {name: part}}
+
+def _parent_names(context, parents):
+    """Names of the local collections in parents; "" stands for the scene collection."""
+    master = context.scene.collection.as_pointer()
+    return ["" if c.as_pointer() == master else c.name for c in parents if c.library is None]
+
+def _resolve_parents(context, names):
+    parents = [context.scene.collection if not n else bpy.data.collections.get((n, None)) for n in names]
+    return [p for p in parents if p is not None] or [active_collection(context)]
+
+def library_parts(fp):
+    """[(kind, name, loaded)] of fp's collections, or its objects if it has none."""
+    lib = find_library(fp)
+    unloaded = unloaded_parts.get(fp, {})
+    entry = library_entry(lib) if lib else _new_index_entry()
+    if entry["collections"] or unloaded.get("collections"):
+        kind, loaded = 'COLLECTION', [c.name for c in entry["collections"]]
+        removed = unloaded.get("collections", {})
+    else:
+        kind, loaded = 'OBJECT', [o.name for o in entry["objects"]]
+        removed = unloaded.get("objects", {})
+    parts = [(kind, n, True) for n in loaded] + [(kind, n, False) for n in removed]
+    return sorted(parts, key=lambda p: p[1].lower())
+
+def _remove_with_data(lib, ids, objects):
+    """batch_remove ids, then the library's object data left without users."""
+    data = {o.data.as_pointer(): o.data for o in objects if o.data and safe_library(o.data) == lib}
+    bpy.data.batch_remove(ids)
+    orphans = [d for d in data.values() if d.users == 0]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+
+def unload_part(context, fp, kind, name):
+    """Remove one collection (with its children and instance empties) or one object of fp."""
+    lib = find_library(fp)
+    if not lib:
+        return False, "Library is not loaded"
+    entry = library_entry(lib)
+    if kind == 'COLLECTION':
+        coll = next((c for c in entry["collections"] if c.name == name), None)
+        if coll is None:
+            return False, f"Collection not found: {name}"
+        doomed = [coll] + [c for c in coll.children_recursive if safe_library(c) == lib]
+        doomed_ptrs = {c.as_pointer() for c in doomed}
+        empties = library_instancers(lib, {c.name for c in doomed})
+        candidates = [context.scene.collection] + [c for c in bpy.data.collections if c.library is None]
+        part = {
+            "parents": _parent_names(context, [p for p in candidates
+                                               if any(ch.as_pointer() == coll.as_pointer() for ch in p.children)]),
+            "transforms": snapshot_instances(empties),
+        }
+        objects = [o for o in coll.all_objects if safe_library(o) == lib
+                   and all(c.as_pointer() in doomed_ptrs for c in o.users_collection)]
+        doomed_ids = {i.as_pointer(): i for i in empties + objects + doomed}
+        _remove_with_data(lib, list(doomed_ids.values()), objects)
+    else:
+        obj = next((o for o in entry["objects"] if o.name == name), None)
+        if obj is None:
+            return False, f"Object not found: {name}"
+        part = {"parents": _parent_names(context, obj.users_collection)}
+        _remove_with_data(lib, [obj], [obj])
+    unloaded_parts.setdefault(fp, {"collections": {}, "objects": {}})[
+        "collections" if kind == 'COLLECTION' else "objects"][name] = part
+    invalidate_library_index()
+    invalidate_footprints()
+    linked_elements[fp] = get_linked_item_names(lib)
+    return True, f"Unloaded: {name}"
+
+def load_part(context, fp, kind, name):
+    """Link a previously unloaded collection or object of fp back in."""
+    key = "collections" if kind == 'COLLECTION' else "objects"
+    part = unloaded_parts.get(fp, {}).get(key, {}).get(name)
+    if part is None:
+        return False, f"{name} is not unloaded"
+    if not find_library(fp):
+        return False, "Load the library first"
+    catalog = library_catalog(fp)
+    with bpy.data.libraries.load(fp, link=True) as (src, dst):
+        setattr(dst, key, linkable_names(src, key, [name], catalog))
+    invalidate_library_index()
+    lib = find_library(fp)
+    entry = library_entry(lib)
+    if kind == 'COLLECTION':
+        coll = next((c for c in entry["collections"] if c.name == name), None)
+        if coll is None:
+            return False, f"Collection not found in library: {name}"
+        for parent in _resolve_parents(context, part["parents"]) if part["parents"] else []:
+            if coll.name not in parent.children:
+                parent.children.link(coll)
+        snapshot = part["transforms"]
+        create_instance_empties(snapshot, range(len(snapshot["names"])),
+                                {c.name: c for c in entry["collections"]}, active_collection(context), UniqueNames())
+    else:
+        obj = next((o for o in entry["objects"] if o.name == name), None)
+        if obj is None:
+            return False, f"Object not found in library: {name}"
+        for parent in _resolve_parents(context, part["parents"]):
+            if obj.name not in parent.objects:
+                parent.objects.link(obj)
+    del unloaded_parts[fp][key][name]
+    invalidate_library_index()
+    invalidate_footprints()
+    touch_library(fp)
+    linked_elements[fp] = get_linked_item_names(lib)
+    return True, f"Loaded: {name}"
+
+# #### Streaming loader
+# Re-links and reloads queued from the UI run from a timer in slices of
+# LOAD_SLICE seconds, stepping restore_library between slices so Blender
+# keeps handling events while large libraries stream in.
+LOAD_SLICE = 0.05
+_loader = {"queue": [], "job": None, "done": 0, "total": 0, "fraction": 0.0, "errors": []}
+
+def queue_library_load(fp, action):
+    """Queue a 'RELINK' or 'RELOAD' of fp. Returns False if fp is already queued."""
+    if library_loading(fp):
+        return False
+    _loader["queue"].append((fp, action))
+    _loader["total"] += 1
+    if not bpy.app.timers.is_registered(_run_loader):
+        bpy.app.timers.register(_run_loader, first_interval=0.01)
+    tag_redraw_viewports()
+    return True
+
+def library_loading(fp):
+    """True if fp is being or waiting to be streamed in."""
+    job = _loader["job"]
+    return (job is not None and job[0] == fp) or any(q[0] == fp for q in _loader["queue"])
+
+def _start_load_job(fp, action):
+    context = bpy.context
+    if action == 'RELINK':
+        if fp not in linked_elements:
+            return False, "No library to unload or reload"
+        if find_library(fp):
+            return False, "Already loaded"
+        steps = restore_library(context, fp, fresh_names=True)
+    elif library_parent(fp):
+        return reload_indirect_library(fp)
+    else:
+        ok, msg = prepare_reload(context, fp)
+        if not ok:
+            return ok, msg
+        steps = restore_library(context, fp)
+    _loader["job"] = (fp, action, steps)
+    _loader["fraction"] = 0.0
+    return True, ""
+
+def _finish_loader():
+    report_errors("Loading failed", _loader["errors"])
+    _loader.update(job=None, done=0, total=0, fraction=0.0, errors=[])
+    force_viewport_refresh()
+    schedule_budget_check()
+
+def _run_loader():
+    deadline = time.perf_counter() + LOAD_SLICE
+    done = _loader["done"]
+    while time.perf_counter() < deadline:
+        job = _loader["job"]
+        if job is None:
+            if not _loader["queue"]:
+                _finish_loader()
+                return None
+            fp, action = _loader["queue"].pop(0)
+            try:
+                ok, msg = _start_load_job(fp, action)
+            except Exception as e:  # a broken library must not wedge the queue
+                _loader["job"] = None
+                ok, msg = False, str(e) or type(e).__name__
+            if not ok:
+                _loader["errors"].append(f"{os.path.basename(fp)}: {msg}")
+            if _loader["job"] is None:
+                _loader["done"] += 1
+            continue
+        fp, action, steps = job
+        try:
+            _loader["fraction"] = next(steps)
+        except StopIteration:
+            if action == 'RELINK':
+                schedule_prewarm(fp)
+            _loader["job"] = None
+            _loader["done"] += 1
+        except Exception as e:  # always clear the job, or library_loading() stays True
+            _loader["errors"].append(f"{os.path.basename(fp)}: {str(e) or type(e).__name__}")
+            _loader["job"] = None
+            _loader["done"] += 1
+    # loader_progress() is read in draw(); rows only change when a library lands
+    if _loader["done"] != done:
+        tag_panel_rows()
+    tag_redraw_viewports()
+    return 0.01
+
+def cancel_library_loads():
+    """Drop queued loads and stop the running one after its current chunk."""
+    job = _loader["job"]
+    _loader["queue"].clear()
+    if job is not None:
+        job[2].close()
+        if not find_library(job[0]):
+            link_active_states[job[0]] = False
+    if bpy.app.timers.is_registered(_run_loader):
+        bpy.app.timers.unregister(_run_loader)
+    if job is not None or _loader["total"]:
+        _finish_loader()
+
+def loader_progress():
+    """(libraries done, total, fraction of the whole queue, current path or None) while streaming."""
+    total = _loader["total"]
+    if not total:
+        return None
+    job = _loader["job"]
+    done = _loader["done"]
+    fraction = (done + (_loader["fraction"] if job else 0.0)) / total
+    return done, total, fraction, job[0] if job else None
+
+def resolution_target(fp):
+    """Path that switching resolution would move fp to (lo <-> hi)."""
+    rs = resolution_status.get(fp, {})
+    if rs:
+        return rs["low_path"] if rs["status"] == "high" else rs["high_path"]
+    return get_hi_res_path(fp) if is_lo_file(fp) else low_res_path(fp)
+
+def is_low_res(fp):
+    """True if fp is currently the low-res side of a pair."""
+    return resolution_status.get(fp, {}).get("status") == "low" or (fp not in resolution_status and is_lo_file(fp))
+
+def switch_library_resolution(context, orig_norm, tgt_fp):
+    """Repoint the library at orig_norm to tgt_fp and keep instance transforms."""
+    # Check if the library is unloaded
+    if orig_norm in link_active_states and not link_active_states[orig_norm]:
+        return False, "Turn visibility ON for switching resolution"
+
+    hi_fp = get_hi_res_path(orig_norm)
+    lib = next(filter(None, map(find_library, variant_family(orig_norm))), None)
+    if not lib:
+        return False, "Linked library not found"
+
+    if normalize_filepath(lib.filepath) == hi_fp:
+        linked_elements[hi_fp] = get_linked_item_names(lib)
+
+    if tgt_fp == hi_fp:
+        release_prewarmed(hi_fp)
+
+    current_fp = normalize_filepath(lib.filepath)
+    linked_elements[current_fp] = get_linked_item_names(lib)
+    snapshot = linked_elements[current_fp].get('transforms') or empty_snapshot()
+
+    set_library_filepath(lib, tgt_fp)
+    reload_library(lib)
+    invalidate_library_index()
+
+    col = active_collection(context)
+    entry = library_entry(lib)
+    col_objects = {o.name for o in col.objects}
+    col_children = {c.name for c in col.children}
+    for obj in entry["objects"]:
+        if obj.name not in col_objects:
+            col.objects.link(obj)
+    for coll in entry["collections"]:
+        if coll.name not in col_children:
+            col.children.link(coll)
+    invalidate_library_index()
+
+    restore_instance_matrices(snapshot)
+    linked_elements[tgt_fp] = get_linked_item_names(lib)
+
+    # determine high and low paths
+    is_orig_lo = resolution_status.get(orig_norm, {}).get("status") == "low" or is_lo_file(orig_norm)
+    is_target_lo = not is_orig_lo
+    high_path = orig_norm if is_target_lo else tgt_fp
+    low_path = tgt_fp if is_target_lo else orig_norm
+
+    # update resolution_status for both
+    for key in [high_path, low_path]:
+        status = "high" if key == high_path else "low"
+        high_res_for_render = resolution_status.get(key, {}).get("high_res_for_render", False)
+        resolution_status[key] = {
+            "status": status,
+            "high_path": high_path,
+            "low_path": low_path,
+            "high_res_for_render": high_res_for_render,
+        }
+
+    if orig_norm in library_order:
+        idx = library_order.index(orig_norm)
+        library_order[idx] = tgt_fp
+
+    if orig_norm in link_active_states:
+        link_active_states[tgt_fp] = link_active_states.pop(orig_norm)
+
+    if orig_norm in expanded_states:
+        expanded_states[tgt_fp] = expanded_states.pop(orig_norm)
+
+    if orig_norm in unloaded_parts:
+        unloaded_parts[tgt_fp] = unloaded_parts.pop(orig_norm)
+
+    if orig_norm in selected_libraries:
+        selected_libraries.discard(orig_norm)
+        selected_libraries.add(tgt_fp)
+
+    library_stamps.pop(orig_norm, None)
+    stale_libraries.discard(orig_norm)
+    record_library_stamp(tgt_fp)
+    if orig_norm in library_last_used:
+        library_last_used[tgt_fp] = library_last_used.pop(orig_norm)
+
+    if is_target_lo:
+        schedule_prewarm(low_path)
+
+    return True, f"Switched to: {os.path.basename(tgt_fp)}"
+
+def ensure_low_res_status(lo_fp):
+    """resolution_status entry for a low-res library (created on demand), or None if not low-res."""
+    if resolution_status.get(lo_fp, {}).get("status") != "low" and not is_lo_file(lo_fp):
+        return None
+    return resolution_status.setdefault(
+        lo_fp, {
+            "status": "low",
+            "low_path": lo_fp,
+            "high_path": get_hi_res_path(lo_fp),
+            "high_res_for_render": False,
+        })
+
+def switch_instance_resolution(lo_fp, resolution, selected_only=False):
+    """Retarget instance empties between the lo and hidden hi library without reloading."""
+    rs = ensure_low_res_status(lo_fp)
+    if rs is None:
+        return False, "Works only on low-res files."
+    lo_lib = find_library(lo_fp)
+    if not lo_lib:
+        return False, "Linked library not found"
+    hi_lib = prewarmed_library(rs["high_path"])
+    if not hi_lib and load_highres_hidden(lo_fp):
+        hi_lib = prewarmed_library(rs["high_path"])
+    if not hi_lib:
+        return False, "No hi-res counterpart to switch to"
+
+    lo_to_hi, hi_to_lo = instance_collection_maps(lo_lib, hi_lib)
+    lo_empties = library_instancers(lo_lib)
+    hi_empties = library_instancers(hi_lib)
+    if selected_only:
+        lo_empties = [o for o in lo_empties if o.select_get()]
+        hi_empties = [o for o in hi_empties if o.select_get()]
+    changed = 0
+    if resolution in {'HIGH', 'TOGGLE'}:
+        changed += retarget_instances(lo_empties, lo_to_hi)
+    if resolution in {'LOW', 'TOGGLE'}:
+        changed += retarget_instances(hi_empties, hi_to_lo)
+    return True, f"{changed} instances switched"
+
+def set_render_resolution(lo_fp, enabled=None):
+    """Toggle hi-res-at-render for a low-res library, or force it when enabled is given."""
+    rs = ensure_low_res_status(lo_fp)
+    if rs is None:
+        return False, "Works only on low-res files."
+    rs["high_res_for_render"] = (not rs["high_res_for_render"]) if enabled is None else enabled
+    if rs["high_res_for_render"]:
+        schedule_prewarm(lo_fp)
+    else:
+        release_prewarmed(rs["high_path"])
+    state = "ON" if rs["high_res_for_render"] else "OFF"
+    return True, f"Hi-res render {state}."
+
+# #### Duplicate merge
+MERGE_ID_TYPES = ('collections', 'objects', 'node_groups', 'actions', 'worlds') + OTHER_ID_TYPES
+
+def forget_library(fp):
+    """Drop the per-library state kept for fp."""
+    selected_libraries.discard(fp)
+    library_stamps.pop(fp, None)
+    stale_libraries.discard(fp)
+    link_active_states.pop(fp, None)
+    linked_elements.pop(fp, None)
+    unloaded_parts.pop(fp, None)
+    library_last_used.pop(fp, None)
+
+def merge_duplicate_libraries(fp):
+    """Remap the users of every duplicate of fp's Library onto one Library and free the others."""
+    group = library_duplicates(fp)
+    if not group:
+        return False, "No duplicate libraries"
+    keep = group[0]
+    if keep.parent is not None:
+        return False, "Duplicates are linked indirectly; merge them in the file that links them"
+    keep_fp = normalize_filepath(keep.filepath)
+    merged = 0
+    for dup in group[1:]:
+        if dup.parent is not None:
+            continue
+        owned = {dt: [item for item in getattr(bpy.data, dt) if safe_library(item) == dup]
+                 for dt in MERGE_ID_TYPES}
+        missing = {dt: [item.name for item in items if getattr(bpy.data, dt).get((item.name, keep.filepath)) is None]
+                   for dt, items in owned.items()}
+        if any(missing.values()):
+            # linking by keep's own path string resolves to keep, not a new Library
+            with bpy.data.libraries.load(keep.filepath, link=True) as (_src, dst):
+                for dt, names in missing.items():
+                    if names:
+                        setattr(dst, dt, names)
+        for dt, items in owned.items():
+            table = getattr(bpy.data, dt)
+            for item in items:
+                target = table.get((item.name, keep.filepath))
+                if target is not None:
+                    item.user_remap(target)
+        dup_fp = normalize_filepath(dup.filepath)
+        bpy.data.libraries.remove(dup)
+        if dup_fp != keep_fp:
+            forget_library(dup_fp)
+            resolution_status.pop(dup_fp, None)
+            expanded_states.pop(dup_fp, None)
+        merged += 1
+    invalidate_library_index()
+    invalidate_library_paths()
+    invalidate_footprints()
+    linked_elements[keep_fp] = get_linked_item_names(keep)
+    touch_library(keep_fp)
+    return True, f"Merged {merged} duplicates into {os.path.basename(keep_fp)}"
+
+# #### Bulk repath
+# Library paths are rewritten by prefix or regex rules matched against the
+# absolute path (forward slashes). Every new target is stat'ed in parallel
+# before anything changes; the per-library state is then re-keyed to the new
+# paths and each affected library reloads once.
+def compile_repath_rule(search, replace, regex=False):
+    """A rule for rewrite_library_path; raises re.error for an invalid pattern."""
+    if regex:
+        return ('REGEX', re.compile(search), replace)
+    return ('PREFIX', search.replace("\\", "/").rstrip("/"), replace.replace("\\", "/").rstrip("/"))
+
+def repath_rules_from_text(text):
+    """Rules from text, one per line: 'old -> new', or 're: pattern -> replacement'."""
+    rules = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or " -> " not in line:
+            continue
+        regex = line.startswith("re:")
+        search, _, replace = line[3 if regex else 0:].rpartition(" -> ")
+        rules.append(compile_repath_rule(search.strip(), replace.strip(), regex))
+    return rules
+
+def rewrite_library_path(path, rules):
+    """path rewritten by the first rule that matches it, or None."""
+    for kind, search, replace in rules:
+        if kind == 'REGEX':
+            new, count = search.subn(replace, path, count=1)
+            if count:
+                return new
+        elif search and (path == search or path.startswith(search + "/")):
+            return replace + path[len(search):]
+    return None
+
+def repath_state(mapping):
+    """Re-key the per-library state from old to new paths ({old fp: new fp})."""
+    def moved(fp):
+        return mapping.get(fp, fp)
+    library_order[:] = dict.fromkeys(map(moved, library_order))
+    for table in (expanded_states, link_active_states, linked_elements, resolution_status,
+                  unloaded_parts, library_last_used):
+        entries = list(table.items())
+        table.clear()
+        table.update((moved(fp), value) for fp, value in entries)
+    for rs in resolution_status.values():
+        rs["high_path"] = moved(rs["high_path"])
+        rs["low_path"] = moved(rs["low_path"])
+    for group in (selected_libraries, ephemeral_hidden_libraries):
+        entries = list(group)
+        group.clear()
+        group.update(map(moved, entries))
+    _prewarm_queue[:] = map(moved, _prewarm_queue)
+    for fp in mapping:
+        library_stamps.pop(fp, None)
+        stale_libraries.discard(fp)
+    invalidate_footprints()
+    tag_panel_rows()
+
+def repath_libraries(rules, skip_missing=False):
+    """Rewrite library paths with rules once every new file is confirmed, then reload them."""
+    if _loader["job"] or _loader["queue"]:
+        return False, "Wait for libraries to finish loading"
+    libs = {normalize_filepath(lib.filepath): lib for lib in bpy.data.libraries}
+    known = dict.fromkeys([*libs, *library_order, *link_active_states, *unloaded_parts])
+    for rs in resolution_status.values():
+        known.update(dict.fromkeys((rs["high_path"], rs["low_path"])))
+
+    targets, indirect = {}, 0
+    for fp in known:
+        path = library_abspath(fp).replace("\\", "/")
+        new = rewrite_library_path(path, rules)
+        if new is None or new == path:
+            continue
+        if fp in libs and libs[fp].parent is not None:
+            indirect += 1  # stored in its parent file, repath that one instead
+            continue
+        targets[fp] = os.path.normpath(new)
+    if not targets:
+        return False, "No library path matches the rules"
+
+    # lo/hi siblings that were never linked are renamed without being required
+    required = [fp for fp in targets if fp in libs or fp in link_active_states]
+    stats = stat_cache.stat_many(targets[fp] for fp in required)
+    missing = [fp for fp in required
+               if stats[targets[fp]] is None or not stat.S_ISREG(stats[targets[fp]].st_mode)]
+    if missing and not skip_missing:
+        names = ", ".join(os.path.basename(fp) for fp in missing[:3])
+        more = ", ..." if len(missing) > 3 else ""
+        return False, f"{len(missing)} new paths not found: {names}{more}"
+    for fp in missing:
+        del targets[fp]
+
+    mapping = {fp: normalize_filepath(new) for fp, new in targets.items()}
+    # two libraries on one path would have their state merged by repath_state()
+    occupied = set(known) - set(mapping)
+    seen, collisions = set(), []
+    for fp, new_fp in mapping.items():
+        if new_fp in occupied or new_fp in seen:
+            collisions.append(fp)
+        seen.add(new_fp)
+    if collisions:
+        names = ", ".join(os.path.basename(fp) for fp in collisions[:3])
+        more = ", ..." if len(collisions) > 3 else ""
+        return False, f"{len(collisions)} libraries would share a path with another library: {names}{more}"
+
+    for fp, new_fp in mapping.items():
+        if fp in libs:
+            set_library_filepath(libs[fp], new_fp)
+    clear_path_caches()
+    repath_state(mapping)
+    for fp in topological_order([mapping[fp] for fp in mapping if fp in libs]):
+        queue_library_load(fp, 'RELOAD')
+
+    msg = f"Repathed {len(mapping)} libraries"
+    if missing:
+        msg += f", skipped {len(missing)} not found"
+    if indirect:
+        msg += f", skipped {indirect} indirect"
+    return True, msg
+
 # ### Operators
 class LINKEDITOR_OT_render_resolution(bpy.types.Operator):
     """Toggle whether this low-res library is swapped to Hi-res at render time."""
@@ -275,21 +2486,12 @@ class LINKEDITOR_OT_render_resolution(bpy.types.Operator):
     filepath: bpy.props.StringProperty()
 
     def execute(self, context):
-        lo_fp = normalize_filepath(self.filepath)
-        if resolution_status.get(lo_fp, {}).get("status") != "low" and not is_lo_file(lo_fp):
-            self.report({'WARNING'}, f"Works only on low-res files.")
+        ok, msg = set_render_resolution(normalize_filepath(self.filepath))
+        if not ok:
+            self.report({'WARNING'}, msg)
             return {'CANCELLED'}
-        rs = resolution_status.setdefault(
-            lo_fp, {
-                "status": "low",
-                "low_path": lo_fp,
-                "high_path": get_hi_res_path(lo_fp),
-                "high_res_for_render": False,
-            })
-        rs["high_res_for_render"] ^= True
         force_viewport_refresh()
-        state = "ON" if rs["high_res_for_render"] else "OFF"
-        self.report({'INFO'}, f"Hi-res render {state}.")
+        self.report({'INFO'}, msg)
         return {'FINISHED'}
 
 class LINKEDITOR_OT_load_and_unload(bpy.types.Operator):
@@ -300,87 +2502,20 @@ class LINKEDITOR_OT_load_and_unload(bpy.types.Operator):
 
     def execute(self, context):
         fp = normalize_filepath(self.filepath)
-        lib = next((l for l in bpy.data.libraries if normalize_filepath(l.filepath) == fp), None)
-
-        # --- Unload existing library ---
-        if lib:
-            linked_elements[fp] = get_linked_item_names(lib)
-            if linked_elements[fp].get('type') == 'collections':
-                active_col = context.view_layer.active_layer_collection.collection
-                collections = linked_elements[fp]['collections']
-                for obj in list(active_col.objects):
-                    if obj.type == 'EMPTY' and obj.instance_collection:
-                        coll = obj.instance_collection
-                        coll_lib = safe_library(coll)
-                        if coll_lib and normalize_filepath(coll_lib.filepath) == fp and coll.name in collections:
-                            bpy.data.objects.remove(obj, do_unlink=True)
-            bpy.data.libraries.remove(lib)
-            link_active_states[fp] = False
-            force_viewport_refresh()
-            self.report({'INFO'}, f"Unloaded: {os.path.basename(fp)}")
-            return {'FINISHED'}
-
-        # --- Reload library if previously known ---
-        elif fp in linked_elements:
-            options = linked_elements[fp].get('options', {}).copy()
-            transforms = linked_elements[fp].get('transforms', {})
-            previous_instances = linked_elements[fp].get('collection_instances', {})
-
-            with bpy.data.libraries.load(fp, link=True) as (src, dst):
-                for dt, names in linked_elements[fp].items():
-                    if dt not in ('options', 'collection_instances', 'type', 'transforms'):
-                        setattr(dst, dt, [e for e in getattr(src, dt) if e in names])
-
-            active_col = context.view_layer.active_layer_collection.collection
-            # remove old empties
-            for obj in list(active_col.objects):
-                if obj.type == 'EMPTY' and obj.instance_collection:
-                    coll = obj.instance_collection
-                    if safe_library(coll) and normalize_filepath(coll.library.filepath) == fp:
-                        bpy.data.objects.remove(obj, do_unlink=True)
-
-            if linked_elements[fp]['type'] == 'collections':
-                for coll_name in linked_elements[fp]['collections']:
-                    coll = next((c for c in bpy.data.collections if c.name == coll_name
-                                 and safe_library(c)
-                                 and normalize_filepath(c.library.filepath) == fp), None)
-                    if not coll:
-                        continue
-                    if options.get('instance_collections'):
-                        empty_name = previous_instances.get(coll_name) or f"{coll_name}_instance"
-                        count = 1
-                        while empty_name in bpy.data.objects:
-                            empty_name = f"{coll_name}_instance.{count:03d}"
-                            count += 1
-                        empty = bpy.data.objects.new(name=empty_name, object_data=None)
-                        empty.instance_type = 'COLLECTION'
-                        empty.instance_collection = coll
-                        empty.rotation_mode = 'QUATERNION'
-                        active_col.objects.link(empty)
-                        tr = transforms.get(coll_name, {})
-                        empty.location = tr.get('location', (0,0,0))
-                        empty.rotation_quaternion = tr.get('rotation', (1,0,0,0))
-                        empty.scale = tr.get('scale', (1,1,1))
-            else:
-                for obj_name in linked_elements[fp].get('objects', []):
-                    obj = bpy.data.objects.get(obj_name)
-                    if obj and safe_library(obj) and normalize_filepath(obj.library.filepath) == fp:
-                        active_col.objects.link(obj)
-
-            lib = next((l for l in bpy.data.libraries if normalize_filepath(l.filepath) == fp), None)
-            if lib and options.get('relative_path'):
-                try:
-                    lib.filepath = bpy.path.relpath(bpy.path.abspath(fp))
-                except ValueError:
-                    pass
-
-            link_active_states[fp] = True
-            force_viewport_refresh()
-            self.report({'INFO'}, f"Reloaded: {os.path.basename(fp)}")
+        if library_loading(fp):
+            self.report({'WARNING'}, "Library is still loading")
+            return {'CANCELLED'}
+        if not find_library(fp) and fp in linked_elements:
+            queue_library_load(fp, 'RELINK')
+            self.report({'INFO'}, f"Loading: {os.path.basename(fp)}")
             return {'FINISHED'}
-
-        self.report({'WARNING'}, "No library to unload or reload")
-        return {'CANCELLED'}
+        ok, msg = toggle_library(context, fp)
+        if not ok:
+            self.report({'WARNING'}, msg)
+            return {'CANCELLED'}
+        force_viewport_refresh()
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
 
 
 # -------------------------------------------------
@@ -394,65 +2529,37 @@ class LINKEDITOR_OT_reload(bpy.types.Operator):
 
     def execute(self, context):
         fp = normalize_filepath(self.filepath)
-        lib = next((l for l in bpy.data.libraries if normalize_filepath(l.filepath) == fp), None)
-
-        # unload if loaded
-        if lib:
-            linked_elements[fp] = get_linked_item_names(lib)
-            if linked_elements[fp]['type'] == 'collections':
-                active_col = context.view_layer.active_layer_collection.collection
-                collections = linked_elements[fp]['collections']
-                for obj in list(active_col.objects):
-                    if obj.type == 'EMPTY' and obj.instance_collection:
-                        coll = obj.instance_collection
-                        if normalize_filepath(coll.library.filepath) == fp and coll.name in collections:
-                            bpy.data.objects.remove(obj, do_unlink=True)
-            bpy.data.libraries.remove(lib)
-
-        items = linked_elements.get(fp)
-        if not items:
+        if not find_library(fp) and not linked_elements.get(fp):
             self.report({'WARNING'}, "No items found to reload")
             return {'CANCELLED'}
+        if not queue_library_load(fp, 'RELOAD'):
+            self.report({'WARNING'}, "Library is still loading")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Reloading: {os.path.basename(fp)}")
+        return {'FINISHED'}
 
-        with bpy.data.libraries.load(fp, link=True) as (src, dst):
-            for dt, names in items.items():
-                if dt in ('options', 'collection_instances', 'type', 'transforms'):
-                    continue
-                setattr(dst, dt, [n for n in names if n in getattr(src, dt, [])])
-
-        active_col = context.view_layer.active_layer_collection.collection
-        if items['type'] == 'collections':
-            for coll_name, empty_name in items['collection_instances'].items():
-                coll = next((c for c in bpy.data.collections if c.name == coll_name
-                             and safe_library(c)
-                             and normalize_filepath(c.library.filepath) == fp), None)
-                if not coll:
-                    continue
-                empty = bpy.data.objects.new(name=empty_name, object_data=None)
-                empty.instance_type = 'COLLECTION'
-                empty.instance_collection = coll
-                empty.rotation_mode = 'QUATERNION'
-                active_col.objects.link(empty)
-                tr = items['transforms'].get(coll_name, {})
-                empty.location = tr.get('location', (0,0,0))
-                empty.rotation_quaternion = tr.get('rotation', (1,0,0,0))
-                empty.scale = tr.get('scale', (1,1,1))
-        else:
-            for obj_name in items.get('objects', []):
-                obj = bpy.data.objects.get(obj_name)
-                if obj and safe_library(obj) and normalize_filepath(obj.library.filepath) == fp:
-                    active_col.objects.link(obj)
 
-        if lib and items.get('options', {}).get('relative_path'):
-            try:
-                lib.filepath = bpy.path.relpath(bpy.path.abspath(fp))
-            except ValueError:
-                pass
+# -------------------------------------------------
+# Operator: Merge Duplicates
+# -------------------------------------------------
+class LINKEDITOR_OT_merge_duplicates(bpy.types.Operator):
+    """Merge libraries that load the same file through different paths into one."""
+    bl_idname = "linkeditor.merge_duplicates"
+    bl_label = "Merge Duplicate Libraries"
+    filepath: StringProperty()
 
-        link_active_states[fp] = True
+    def execute(self, context):
+        fp = normalize_filepath(self.filepath)
+        if any(library_loading(normalize_filepath(l.filepath)) for l in library_duplicates(fp)):
+            self.report({'WARNING'}, "Library is still loading")
+            return {'CANCELLED'}
+        ok, msg = merge_duplicate_libraries(fp)
+        self.report({'INFO'} if ok else {'WARNING'}, msg)
+        if not ok:
+            return {'CANCELLED'}
         force_viewport_refresh()
-        self.report({'INFO'}, f"Reloaded: {os.path.basename(fp)}")
         return {'FINISHED'}
+
 # -------------------------------------------------
 # Operator: Remove
 # -------------------------------------------------
@@ -468,12 +2575,61 @@ class LINKEDITOR_OT_relocate(bpy.types.Operator, ImportHelper):
     def execute(self, _):
         new = normalize_filepath(self.filepath)
         old = normalize_filepath(self.original_filepath)
-        for lib in bpy.data.libraries:
-            if normalize_filepath(lib.filepath) == old:
-                lib.filepath = new
-                break
+        lib = find_library(old)
+        if lib:
+            set_library_filepath(lib, new)
+        clear_path_caches()
+        repath_state({old: new})
         return {'FINISHED'}
 
+class LINKEDITOR_OT_repath(bpy.types.Operator):
+    """Rewrite the paths of many libraries at once, e.g. after a project moved."""
+    bl_idname = "linkeditor.repath"
+    bl_label = "Repath Libraries"
+    mode: bpy.props.EnumProperty(
+        name="Rules",
+        items=[
+            ('PREFIX', "Prefix", "Replace a leading folder"),
+            ('REGEX', "Regex", "Regular expression substitution on the absolute path (\\1 for groups)"),
+            ('TEXT', "Text", "One rule per line of a text datablock: 'old -> new' or 're: pattern -> replacement'"),
+        ])
+    search: bpy.props.StringProperty(name="Find")
+    replace: bpy.props.StringProperty(name="Replace")
+    rules_text: bpy.props.StringProperty(name="Text")
+    skip_missing: bpy.props.BoolProperty(
+        name="Skip Missing", description="Repath the libraries whose new file exists and leave the others")
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=480)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.row().prop(self, "mode", expand=True)
+        if self.mode == 'TEXT':
+            layout.prop_search(self, "rules_text", bpy.data, "texts")
+        else:
+            layout.prop(self, "search")
+            layout.prop(self, "replace")
+        layout.prop(self, "skip_missing")
+
+    def execute(self, context):
+        try:
+            if self.mode == 'TEXT':
+                text = bpy.data.texts.get(self.rules_text)
+                rules = repath_rules_from_text(text.as_string()) if text else []
+            else:
+                rules = [compile_repath_rule(self.search, self.replace, self.mode == 'REGEX')] if self.search else []
+        except re.error as e:
+            self.report({'ERROR'}, f"Invalid pattern: {e}")
+            return {'CANCELLED'}
+        if not rules:
+            self.report({'WARNING'}, "No repath rules given")
+            return {'CANCELLED'}
+        ok, msg = repath_libraries(rules, self.skip_missing)
+        self.report({'INFO'} if ok else {'WARNING'}, msg)
+        tag_redraw_viewports()
+        return {'FINISHED'} if ok else {'CANCELLED'}
+
 class LINKEDITOR_OT_remove(bpy.types.Operator):
     """Delete a linked .blend (handles hi- and lo-res) and re-link collections from other active libraries."""
     bl_idname = "linkeditor.remove"
@@ -482,31 +2638,30 @@ class LINKEDITOR_OT_remove(bpy.types.Operator):
 
     def execute(self, context):
         fp = normalize_filepath(self.filepath)
-        lib = next((l for l in bpy.data.libraries if normalize_filepath(l.filepath) == fp), None)
+        lib = find_library(fp)
         if not lib:
             self.report({'WARNING'}, "Library not found")
             return {'CANCELLED'}
         name = os.path.basename(fp)
+        if lib.parent:
+            self.report({'WARNING'}, f"Linked through {os.path.basename(lib.parent.filepath)}; remove that library instead")
+            return {'CANCELLED'}
 
         active_col = context.view_layer.active_layer_collection.collection
         # remove empties only from this file
         if fp in linked_elements and 'collections' in linked_elements[fp]:
-            for obj in list(active_col.objects):
-                if obj.type == 'EMPTY' and obj.instance_collection:
-                    coll = obj.instance_collection
-                    coll_lib = safe_library(coll)
-                    if coll_lib and normalize_filepath(coll_lib.filepath) == fp and coll.name in linked_elements[fp]['collections']:
-                        bpy.data.objects.remove(obj, do_unlink=True)
+            remove_library_instancers(lib, set(linked_elements[fp]['collections']), active_col)
         # remove the library data
         try:
             bpy.data.libraries.remove(lib)
         except RuntimeError as e:
             self.report({'ERROR'}, f"Could not delete library: {e}")
             return {'CANCELLED'}
+        invalidate_library_index()
 
+        release_prewarmed(resolution_status.get(fp, {}).get("high_path"))
         # cleanup internal state
-        link_active_states.pop(fp, None)
-        linked_elements.pop(fp, None)
+        forget_library(fp)
         rs = resolution_status.pop(fp, None)
         if rs:
             other = rs["high_path"] if rs["status"] == "low" else rs["low_path"]
@@ -515,49 +2670,59 @@ class LINKEDITOR_OT_remove(bpy.types.Operator):
             resolution_status.pop(other, None)
         else:
             # fallback to naming
-            if is_lo_file(fp):
-                other = get_hi_res_path(fp)
-            else:
-                other = fp[:-6] + LO_SUFFIX if fp.lower().endswith(".blend") else ""
-            if other:
+            other = resolution_target(fp)
+            if other != fp:
                 link_active_states.pop(other, None)
                 linked_elements.pop(other, None)
                 resolution_status.pop(other, None)
 
         # re-link collections for other active libraries to restore their empties
+        names = UniqueNames()
         for other_fp, active in list(link_active_states.items()):
             if not active:
                 continue
             info = linked_elements.get(other_fp)
             if not info or info.get('type') != 'collections':
                 continue
-            for coll_name in info['collections']:
-                # find the right collection by filepath
-                coll = next((c for c in bpy.data.collections
-                             if c.name == coll_name
-                             and safe_library(c)
-                             and normalize_filepath(c.library.filepath) == other_fp), None)
-                if not coll:
-                    continue
-                # check if empty already exists
-                exists = any(o for o in active_col.objects
-                             if o.type=='EMPTY' and o.instance_collection==coll)
-                if not exists:
-                    empty = bpy.data.objects.new(name=f"{coll_name}_instance", object_data=None)
-                    empty.instance_type = 'COLLECTION'
-                    empty.instance_collection = coll
-                    empty.rotation_mode = 'QUATERNION'
-                    active_col.objects.link(empty)
-                    # restore transform if known
-                    tr = info.get('transforms', {}).get(coll_name, {})
-                    empty.location = tr.get('location', (0,0,0))
-                    empty.rotation_quaternion = tr.get('rotation', (1,0,0,0))
-                    empty.scale = tr.get('scale', (1,1,1))
+            other_lib = find_library(other_fp)
+            if not other_lib:
+                continue
+            lib_collections = {c.name: c for c in library_entry(other_lib)["collections"]}
+            # recreate captured empties that no longer exist
+            snapshot = info.get('transforms') or empty_snapshot()
+            missing = [i for i, name in enumerate(snapshot["names"]) if name not in names.taken]
+            create_instance_empties(snapshot, missing, lib_collections, active_col, names)
 
+        invalidate_library_index()
         self.report({'INFO'}, f"Deleted: {name}")
         force_viewport_refresh()
         return {'FINISHED'}
 
+class LINKEDITOR_OT_toggle_part(bpy.types.Operator):
+    """Unload or load back a single collection or object of a library."""
+    bl_idname = "linkeditor.toggle_part"
+    bl_label = "Toggle Library Part"
+    filepath: StringProperty()
+    kind: bpy.props.EnumProperty(items=[('COLLECTION', "Collection", ""), ('OBJECT', "Object", "")])
+    part: StringProperty()
+
+    def execute(self, context):
+        fp = normalize_filepath(self.filepath)
+        if library_loading(fp):
+            self.report({'WARNING'}, "Library is still loading")
+            return {'CANCELLED'}
+        key = "collections" if self.kind == 'COLLECTION' else "objects"
+        if self.part in unloaded_parts.get(fp, {}).get(key, {}):
+            ok, msg = load_part(context, fp, self.kind, self.part)
+        else:
+            ok, msg = unload_part(context, fp, self.kind, self.part)
+        if not ok:
+            self.report({'WARNING'}, msg)
+            return {'CANCELLED'}
+        force_viewport_refresh()
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
 class LINKEDITOR_OT_toggle_expand(bpy.types.Operator):
     """Toggle the expanded state of a library in the UI."""
     bl_idname = "linkeditor.toggle_expand"
@@ -567,6 +2732,7 @@ class LINKEDITOR_OT_toggle_expand(bpy.types.Operator):
     def execute(self, _):
         n = normalize_filepath(self.filepath)
         expanded_states[n] = not expanded_states.get(n, False)
+        tag_panel_rows()
         return {'FINISHED'}
 
 class LINKEDITOR_OT_switch_mode(bpy.types.Operator, ImportHelper):
@@ -577,104 +2743,478 @@ class LINKEDITOR_OT_switch_mode(bpy.types.Operator, ImportHelper):
     filter_glob: bpy.props.StringProperty(default="*.blend", options={'HIDDEN'})
 
     def invoke(self, context, event):
-        orig = normalize_filepath(self.original_filepath)
-        rs = resolution_status.get(orig, {})
-        if rs:
-            tgt = rs["low_path"] if rs["status"] == "high" else rs["high_path"]
-        else:
-            hi_fp = get_hi_res_path(orig)
-            lo_fp = hi_fp[:-6] + LO_SUFFIX
-            tgt = lo_fp if orig == hi_fp else hi_fp
-        if not os.path.exists(bpy.path.abspath(tgt)):
+        tgt = resolution_target(normalize_filepath(self.original_filepath))
+        if not library_exists(tgt):
             context.window_manager.fileselect_add(self)
             return {'RUNNING_MODAL'}
         self.filepath = tgt
         return self.execute(context)
 
     def execute(self, context):
-        orig_norm = normalize_filepath(self.original_filepath)
-        tgt_fp = normalize_filepath(self.filepath)
+        ok, msg = switch_library_resolution(context, normalize_filepath(self.original_filepath),
+                                            normalize_filepath(self.filepath))
+        if not ok:
+            self.report({'WARNING'}, msg)
+            return {'CANCELLED'}
+        force_viewport_refresh()
+        return {'FINISHED'}
 
-        # Check if the library is unloaded
-        if orig_norm in link_active_states and not link_active_states[orig_norm]:
-            self.report({'WARNING'}, "Turn visibility ON for switching resolution")
+class LINKEDITOR_OT_switch_instances(bpy.types.Operator):
+    """Switch instances of this low-res library to hi-res or back without reloading it."""
+    bl_idname = "linkeditor.switch_instances"
+    bl_label = "Switch Instance Resolution"
+    filepath: bpy.props.StringProperty()
+    resolution: bpy.props.EnumProperty(
+        name="Resolution",
+        items=[
+            ('TOGGLE', "Toggle", "Swap every affected instance to the other resolution"),
+            ('HIGH', "Hi-res", "Use the hi-res collections"),
+            ('LOW', "Low-res", "Use the low-res collections"),
+        ])
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        description="Only switch the selected instance empties",
+        default=True)
+
+    def execute(self, context):
+        ok, msg = switch_instance_resolution(normalize_filepath(self.filepath),
+                                             self.resolution, self.selected_only)
+        if not ok:
+            self.report({'WARNING'}, msg)
             return {'CANCELLED'}
+        force_viewport_refresh()
+        self.report({'INFO'}, msg)
+        return {'FINISHED'}
 
-        hi_fp = get_hi_res_path(orig_norm)
-        lo_fp = hi_fp[:-6] + LO_SUFFIX
-        lib = next((l for l in bpy.data.libraries if normalize_filepath(l.filepath) in {hi_fp, lo_fp}), None)
-        if not lib:
-            self.report({'ERROR'}, "Linked library not found")
+class LINKEDITOR_OT_reload_changed(bpy.types.Operator):
+    """Reload only the libraries whose files changed since they were linked."""
+    bl_idname = "linkeditor.reload_changed"
+    bl_label = "Reload Changed"
+
+    def execute(self, context):
+        loaded = [r["filepath"] for r in get_panel_rows() if find_library(r["filepath"])]
+        update_stale_libraries(loaded)
+        changed = topological_order([fp for fp in loaded if fp in stale_libraries])
+        queued = sum(queue_library_load(fp, 'RELOAD') for fp in changed)
+        if not changed:
+            self.report({'INFO'}, "All libraries are up to date")
+        else:
+            self.report({'INFO'}, f"Reloading {queued} changed libraries")
+        return {'FINISHED'}
+
+class LINKEDITOR_OT_inspect_libraries(bpy.types.Operator):
+    """List the contents of many libraries in background Blender processes."""
+    bl_idname = "linkeditor.inspect_libraries"
+    bl_label = "Inspect Libraries"
+    target: bpy.props.EnumProperty(
+        name="Libraries",
+        items=[
+            ('LINKED', "Linked", "Every listed library and its lo/hi sibling"),
+            ('DIRECTORY', "Folder", "Every .blend file below a folder"),
+        ])
+    directory: bpy.props.StringProperty(subtype='DIR_PATH')
+
+    def invoke(self, context, event):
+        if self.target == 'DIRECTORY':
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+        return self.execute(context)
+
+    def execute(self, context):
+        if self.target == 'DIRECTORY':
+            root = bpy.path.abspath(self.directory)
+            paths = [os.path.join(d, f) for d, _, files in os.walk(root)
+                     for f in files if f.lower().endswith(".blend")]
+        else:
+            paths = []
+            for r in get_panel_rows():
+                paths.append(r["filepath"])
+                paths.append(resolution_target(r["filepath"]))
+        count = start_inspection(paths)
+        if not count:
+            self.report({'WARNING'}, "No .blend files to inspect")
             return {'CANCELLED'}
+        self.report({'INFO'}, f"Inspecting {count} libraries in the background")
+        return {'FINISHED'}
+
+class LINKEDITOR_OT_generate_proxies(bpy.types.Operator):
+    """Write low-res proxies of hi-res libraries in background Blender processes."""
+    bl_idname = "linkeditor.generate_proxies"
+    bl_label = "Generate Low-res Proxies"
+    target: bpy.props.EnumProperty(
+        name="Libraries",
+        items=[
+            ('LINKED', "Linked", "The hi-res file of every listed library"),
+            ('DIRECTORY', "Folder", "Every hi-res .blend file below a folder"),
+        ])
+    directory: bpy.props.StringProperty(subtype='DIR_PATH')
+    force: bpy.props.BoolProperty(name="Force", description="Regenerate proxies that are up to date")
+    overwrite: bpy.props.BoolProperty(
+        name="Overwrite Existing",
+        description="Also replace low-res files that were not generated by Link Manager (e.g. hand-made ones)")
+
+    def invoke(self, context, event):
+        if self.target == 'DIRECTORY':
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+        return self.execute(context)
 
-        if normalize_filepath(lib.filepath) == hi_fp:
-            linked_elements[hi_fp] = get_linked_item_names(lib)
+    def execute(self, context):
+        if self.target == 'DIRECTORY':
+            root = bpy.path.abspath(self.directory)
+            paths = [os.path.join(d, f) for d, _, files in os.walk(root)
+                     for f in files if f.lower().endswith(".blend")]
+        else:
+            paths = [get_hi_res_path(r["filepath"]) for r in get_panel_rows()]
+        count = start_proxy_generation(paths, self.force, self.overwrite)
+        if not count:
+            self.report({'WARNING'}, "No hi-res .blend files found")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Generating proxies for {count} libraries in the background")
+        return {'FINISHED'}
 
-        if tgt_fp == hi_fp:
-            hid = next((h for h in ephemerally_loaded_libraries if normalize_filepath(h.filepath) == hi_fp), None)
-            if hid:
-                bpy.data.libraries.remove(hid)
-                ephemerally_loaded_libraries.discard(hid)
-            ephemeral_hidden_libraries.discard(hi_fp)
+class LINKEDITOR_OT_cancel_proxies(bpy.types.Operator):
+    """Stop the background proxy generation."""
+    bl_idname = "linkeditor.cancel_proxies"
+    bl_label = "Cancel Proxy Generation"
 
-        current_fp = normalize_filepath(lib.filepath)
-        linked_elements[current_fp] = get_linked_item_names(lib)
-        transforms = linked_elements[current_fp].get('transforms', {})
+    def execute(self, context):
+        cancel_proxy_generation()
+        tag_panel_rows()
+        return {'FINISHED'}
 
-        lib.filepath = tgt_fp
-        reload_library(lib)
+class LINKEDITOR_OT_cancel_inspection(bpy.types.Operator):
+    """Stop the background library inspection."""
+    bl_idname = "linkeditor.cancel_inspection"
+    bl_label = "Cancel Inspection"
 
-        col = context.view_layer.active_layer_collection.collection
-        for obj in bpy.data.objects:
-            if obj.library == lib and obj.name not in col.objects:
-                col.objects.link(obj)
-        for coll in bpy.data.collections:
-            if coll.library == lib and coll.name not in col.children:
-                col.children.link(coll)
-
-        linked_elements[tgt_fp] = get_linked_item_names(lib)
-        if linked_elements[tgt_fp].get('type') == 'collections':
-            for coll_name in linked_elements[tgt_fp].get('collections', []):
-                if coll_name in transforms:
-                    for obj in col.objects:
-                        if obj.type == 'EMPTY' and obj.instance_collection and obj.instance_collection.name == coll_name:
-                            obj.rotation_mode = 'QUATERNION'
-                            obj.location = transforms[coll_name].get('location', [0, 0, 0])
-                            obj.rotation_quaternion = transforms[coll_name].get('rotation', [1, 0, 0, 0])
-                            obj.scale = transforms[coll_name].get('scale', [1, 1, 1])
-                            break
-
-        # determine high and low paths
-        is_orig_lo = resolution_status.get(orig_norm, {}).get("status") == "low" or is_lo_file(orig_norm)
-        is_target_lo = not is_orig_lo
-        high_path = orig_norm if is_target_lo else tgt_fp
-        low_path = tgt_fp if is_target_lo else orig_norm
-
-        # update resolution_status for both
-        for key in [high_path, low_path]:
-            status = "high" if key == high_path else "low"
-            high_res_for_render = resolution_status.get(key, {}).get("high_res_for_render", False)
-            resolution_status[key] = {
-                "status": status,
-                "high_path": high_path,
-                "low_path": low_path,
-                "high_res_for_render": high_res_for_render,
-            }
+    def execute(self, context):
+        cancel_inspection()
+        tag_panel_rows()
+        return {'FINISHED'}
+
+class LINKEDITOR_OT_clear_status(bpy.types.Operator):
+    """Dismiss the status message."""
+    bl_idname = "linkeditor.clear_status"
+    bl_label = "Dismiss"
+
+    def execute(self, context):
+        set_status("")
+        return {'FINISHED'}
+
+class LINKEDITOR_OT_cancel_loading(bpy.types.Operator):
+    """Stop streaming libraries in; the library being loaded keeps what it has so far."""
+    bl_idname = "linkeditor.cancel_loading"
+    bl_label = "Cancel Loading"
+
+    def execute(self, context):
+        cancel_library_loads()
+        return {'FINISHED'}
+
+class LINKEDITOR_OT_fit_budget(bpy.types.Operator):
+    """Switch to low-res or unload least-recently-used libraries until the memory budget is met."""
+    bl_idname = "linkeditor.fit_budget"
+    bl_label = "Fit to Memory Budget"
+
+    def execute(self, context):
+        if not memory_budget():
+            self.report({'WARNING'}, "No memory budget set in the add-on preferences")
+            return {'CANCELLED'}
+        taken = enforce_memory_budget(context)
+        force_viewport_refresh()
+        if memory_usage() > memory_budget():
+            self.report({'WARNING'}, f"{len(taken)} libraries changed, still over budget")
+        else:
+            self.report({'INFO'}, f"{len(taken)} libraries changed to fit the budget")
+        return {'FINISHED'}
+
+class LINKEDITOR_OT_toggle_select(bpy.types.Operator):
+    """Add or remove a library from the batch selection."""
+    bl_idname = "linkeditor.toggle_select"
+    bl_label = "Toggle Selection"
+    filepath: bpy.props.StringProperty()
+
+    def execute(self, _):
+        n = normalize_filepath(self.filepath)
+        if n in selected_libraries:
+            selected_libraries.discard(n)
+        else:
+            selected_libraries.add(n)
+        tag_panel_rows()
+        return {'FINISHED'}
 
-        if orig_norm in library_order:
-            idx = library_order.index(orig_norm)
-            library_order[idx] = tgt_fp
+class LINKEDITOR_OT_batch(bpy.types.Operator):
+    """Apply one action to several libraries and refresh the viewport once."""
+    bl_idname = "linkeditor.batch"
+    bl_label = "Batch Library Action"
+    action: bpy.props.EnumProperty(
+        name="Action",
+        items=[
+            ('UNLOAD', "Unload", "Unload the libraries"),
+            ('LOAD', "Load", "Re-link unloaded libraries"),
+            ('RELOAD', "Reload", "Reload the libraries"),
+            ('TO_LOW', "Low-res", "Switch to the low-res version"),
+            ('TO_HIGH', "Hi-res", "Switch to the hi-res version"),
+            ('RENDER_HI_ON', "Hi-res Render On", "Swap to hi-res at render time"),
+            ('RENDER_HI_OFF', "Hi-res Render Off", "Keep low-res at render time"),
+        ])
+    target: bpy.props.EnumProperty(
+        name="Libraries",
+        items=[
+            ('SELECTED', "Selected", "Libraries ticked in the panel"),
+            ('ALL', "All", "Every listed library"),
+            ('LO_CAPABLE', "Lo-res Capable", "Libraries that have a low-res sibling"),
+            ('GLOB', "Pattern", "Libraries whose file name matches the pattern"),
+        ])
+    pattern: bpy.props.StringProperty(name="Pattern", default="*.blend")
+
+    def invoke(self, context, event):
+        if self.target == 'GLOB':
+            return context.window_manager.invoke_props_dialog(self)
+        return self.execute(context)
 
-        if orig_norm in link_active_states:
-            link_active_states[tgt_fp] = link_active_states.pop(orig_norm)
+    def targets(self):
+        rows = get_panel_rows()
+        if self.target == 'SELECTED':
+            return [r["filepath"] for r in rows if r["filepath"] in selected_libraries]
+        if self.target == 'GLOB':
+            return [r["filepath"] for r in rows
+                    if fnmatch.fnmatch(r["name"], self.pattern) or fnmatch.fnmatch(r["filepath"], self.pattern)]
+        if self.target == 'LO_CAPABLE':
+            return [r["filepath"] for r in rows
+                    if r["is_lo"] or library_exists(resolution_target(r["filepath"]))]
+        return [r["filepath"] for r in rows]
 
-        if orig_norm in expanded_states:
-            expanded_states[tgt_fp] = expanded_states.pop(orig_norm)
+    def execute(self, context):
+        done, failed, queued = 0, 0, 0
+        for fp in topological_order(self.targets()):
+            if library_loading(fp):
+                continue
+            loaded = find_library(fp) is not None
+            if self.action == 'UNLOAD':
+                if not loaded:
+                    continue
+                ok, _ = unload_library(context, fp)
+            elif self.action in {'LOAD', 'RELOAD'}:
+                if loaded == (self.action == 'LOAD'):
+                    continue
+                queued += queue_library_load(fp, 'RELINK' if self.action == 'LOAD' else 'RELOAD')
+                continue
+            elif self.action in {'TO_LOW', 'TO_HIGH'}:
+                if is_low_res(fp) == (self.action == 'TO_LOW'):
+                    continue
+                tgt = resolution_target(fp)
+                if not library_exists(tgt):
+                    failed += 1
+                    continue
+                ok, _ = switch_library_resolution(context, fp, normalize_filepath(tgt))
+            else:
+                if not is_low_res(fp):
+                    continue
+                ok, _ = set_render_resolution(fp, self.action == 'RENDER_HI_ON')
+            done += ok
+            failed += not ok
 
         force_viewport_refresh()
+        if queued:
+            self.report({'INFO'}, f"Loading {queued} libraries")
+        elif failed:
+            self.report({'WARNING'}, f"{done} libraries updated, {failed} failed")
+        else:
+            self.report({'INFO'}, f"{done} libraries updated")
         return {'FINISHED'}
 
+# ### Preferences
+class LINKEDITOR_AP_preferences(bpy.types.AddonPreferences):
+    bl_idname = __name__
+
+    prewarm_hi_res: bpy.props.BoolProperty(
+        name="Pre-warm Hi-res for Render",
+        description="Link the hi-res datablocks of libraries flagged for hi-res render in the "
+                    "background, so rendering only remaps users instead of reloading files",
+        default=False,
+        update=lambda self, context: schedule_prewarm(),
+    )
+
+    worker_count: bpy.props.IntProperty(
+        name="Background Workers",
+        description="Headless Blender processes used for bulk library work (0 = one per CPU core)",
+        default=0, min=0)
+    proxy_ratio: bpy.props.FloatProperty(
+        name="Proxy Detail",
+        description="Fraction of faces generated low-res proxies keep",
+        default=0.25, min=0.01, max=1.0, subtype='FACTOR')
+    proxy_max_texture: bpy.props.IntProperty(
+        name="Proxy Texture Size",
+        description="Largest texture side in generated proxies; bigger images are downscaled (0 = keep)",
+        default=512, min=0)
+
+    stamp_hash: bpy.props.BoolProperty(
+        name="Hash Library Files",
+        description="Also compare a sampled content hash, so touched but unchanged files are not reloaded",
+        default=False)
+    watch_libraries: bpy.props.BoolProperty(
+        name="Watch Library Files",
+        description="Flag libraries whose files change on disk (inotify on Linux, polling elsewhere)",
+        default=False,
+        update=update_library_watch)
+    watch_interval: bpy.props.FloatProperty(
+        name="Watch Interval", description="Seconds between checks for changed library files",
+        default=2.0, min=0.2, subtype='TIME', unit='TIME')
+
+    memory_budget: bpy.props.IntProperty(
+        name="Memory Budget",
+        description="Estimated memory (MB) linked libraries may use before least-recently-used "
+                    "ones are switched to low-res or unloaded (0 = no budget)",
+        default=0, min=0, update=schedule_budget_check)
+    budget_action: bpy.props.EnumProperty(
+        name="Over Budget",
+        items=[
+            ('BOTH', "Low-res, then Unload", "Switch to low-res first, unload if still over budget"),
+            ('LOW_RES', "Switch to Low-res", "Only switch libraries to their low-res version"),
+            ('UNLOAD', "Unload", "Only unload libraries"),
+        ],
+        default='BOTH', update=schedule_budget_check)
+
+    stat_ttl: bpy.props.FloatProperty(
+        name="File Info Refresh",
+        description="Seconds before cached library file information (existence, size, date) is "
+                    "re-read in the background",
+        default=30.0, min=1.0, subtype='TIME', unit='TIME', update=update_stat_ttl)
+
+    variant_rules: bpy.props.StringProperty(
+        name="Low-res Naming",
+        description="How reduced-detail files are named: levels separated by ';', alternatives by ','. "
+                    "An entry is a file name suffix, optionally after a subfolder ending in '/' "
+                    "(e.g. \"_Lo, proxy/; _LOD2\")",
+        default=variants.DEFAULT_RULES, update=update_variant_rules)
+    lo_level: bpy.props.IntProperty(
+        name="Low-res Level",
+        description="Detail level used when switching to low-res (1 = first level of the naming rules)",
+        default=1, min=1, max=16, update=update_variant_rules)
+
+    def draw(self, context):
+        self.layout.prop(self, "prewarm_hi_res")
+        self.layout.prop(self, "worker_count")
+        row = self.layout.row()
+        row.prop(self, "proxy_ratio")
+        row.prop(self, "proxy_max_texture")
+        self.layout.prop(self, "stamp_hash")
+        row = self.layout.row()
+        row.prop(self, "watch_libraries")
+        row.prop(self, "watch_interval")
+        self.layout.prop(self, "stat_ttl")
+        row = self.layout.row()
+        row.prop(self, "variant_rules")
+        row.prop(self, "lo_level")
+        row = self.layout.row()
+        row.prop(self, "memory_budget")
+        row.prop(self, "budget_action", text="")
+
 # ### UI Panel
+# The panel draws from a cached row model. It is rebuilt only when the library
+# set changes or tag_panel_rows() is called after a state change, so draw()
+# itself does no path normalization.
+_panel_rows = {"key": None, "rows": [], "usage": 0}
+_panel_state = {"version": 0}
+
+def tag_panel_rows():
+    """Mark the panel row model stale."""
+    _panel_state["version"] += 1
+
+def build_panel_rows():
+    """Reconcile library_order with bpy.data.libraries and return one row per visible library."""
+    base = get_hi_res_path
+    live_by_base = {}
+    for lib in bpy.data.libraries:
+        fp = normalize_filepath(lib.filepath)
+        # a hi-res library linked hidden shares its base with the lo row it serves
+        if lib in ephemerally_loaded_libraries or fp in ephemeral_hidden_libraries:
+            continue
+        live_by_base.setdefault(base(fp), fp)
+    library_order[:] = [fp for fp in library_order if base(fp) in live_by_base or fp in link_active_states]
+    known = {base(k) for k in library_order}
+    for b, fp in live_by_base.items():
+        if b not in known:
+            library_order.append(fp)
+            known.add(b)
+
+    duplicates = {normalize_filepath(l.filepath): group for group in duplicate_groups() for l in group}
+    rows = []
+    for fp in library_order:
+        live_fp = live_by_base.get(base(fp), fp)
+        rs = resolution_status.get(live_fp, {})
+        if live_fp in ephemeral_hidden_libraries or rs.get("hidden"):
+            continue
+        is_lo = rs.get("status") == "low" or (live_fp not in resolution_status and is_lo_file(live_fp))
+        details = []
+        parts = []
+        if expanded_states.get(live_fp, False):
+            parts = library_parts(live_fp)
+            footprint = library_footprint(live_fp)
+            if footprint:
+                details.append(f"Memory: ~{format_bytes(footprint)}")
+            # panel rows never wait on the disk; a pending read re-tags the rows when it lands
+            catalog = library_catalog(live_fp, wait=False)
+            if catalog is None:
+                details.append("Scanning…")
+            else:
+                details.extend(f"{dt.replace('_', ' ').title()}: {len(catalog[dt])}"
+                               for dt in ("collections", "objects", "meshes", "materials", "images")
+                               if catalog.get(dt))
+            same_file = [os.path.basename(l.filepath) for l in duplicates.get(live_fp, [])
+                         if normalize_filepath(l.filepath) != live_fp]
+            if same_file:
+                details.append(f"Same file as: {', '.join(same_file)}")
+            if is_lo:
+                pairs = lo_hi_correspondence(live_fp, rs.get("high_path") or get_hi_res_path(live_fp), wait=False)
+                if pairs is None:
+                    details.append("Hi-res match: scanning…")
+                elif pairs[0] or pairs[1]:
+                    matched, missing = pairs
+                    details.append(f"Hi-res match: {len(matched)}/{len(matched) + len(missing)}")
+                    details.extend(f"No hi-res for: {n}" for n in missing[:5])
+        rows.append({
+            "filepath": live_fp,
+            "details": details,
+            "name": os.path.basename(bpy.path.abspath(live_fp)),
+            "is_lo": is_lo,
+            "is_loaded": link_active_states.get(live_fp, True),
+            "hi_render": rs.get("high_res_for_render", False),
+            "stale": live_fp in stale_libraries,
+            "duplicates": max(len(duplicates.get(live_fp, ())) - 1, 0),
+            "parts": parts,
+        })
+
+    prefetch_library_stats(r["filepath"] for r in rows)
+
+    # nest indirect libraries under the library they are linked through
+    parents = library_parents()
+    listed = {r["filepath"] for r in rows}
+    children = {}
+    for r in rows:
+        parent = parents.get(r["filepath"])
+        r["indirect"] = parent is not None
+        children.setdefault(parent if parent in listed else None, []).append(r)
+    ordered = []
+    stack = [(r, 0) for r in reversed(children.get(None, []))]
+    while stack:
+        r, depth = stack.pop()
+        r["depth"] = depth
+        ordered.append(r)
+        stack.extend((c, depth + 1) for c in reversed(children.get(r["filepath"], [])))
+    ordered.extend(dict(r, depth=0) for r in rows if "depth" not in r)
+    return ordered
+
+def get_panel_rows():
+    """Cached row model, rebuilt when the library set or tagged state changed."""
+    key = (_panel_state["version"], library_generation())
+    if key != _panel_rows["key"]:
+        _panel_rows["rows"] = build_panel_rows()
+        _panel_rows["usage"] = memory_usage()
+        _panel_rows["key"] = key
+    return _panel_rows["rows"]
+
 class LINKEDITOR_PT_panel(bpy.types.Panel):
     bl_label = "Link Manager"
     bl_idname = "LINKEDITOR_PT_panel"
@@ -684,58 +3224,163 @@ class LINKEDITOR_PT_panel(bpy.types.Panel):
 
     def draw(self, context):
         layout = self.layout
-        base = get_hi_res_path
-
-        layout.label(text="Linked Files:")
-        current_norm = [normalize_filepath(l.filepath) for l in bpy.data.libraries]
-        bases_in_scene = {base(fp) for fp in current_norm}
-        library_order[:] = [fp for fp in library_order if base(fp) in bases_in_scene or fp in link_active_states]
-        for fp in current_norm:
-            if base(fp) not in {base(k) for k in library_order}:
-                library_order.append(fp)
-
-        for fp in library_order:
-            live_fp = next((c for c in current_norm if base(c) == base(fp)), fp)
-            abs_fp = bpy.path.abspath(live_fp)
-            if live_fp in ephemeral_hidden_libraries or resolution_status.get(live_fp, {}).get("hidden"):
-                continue
 
+        rows = get_panel_rows()
+        row = layout.row()
+        row.label(text="Linked Files:")
+        usage, budget = _panel_rows["usage"], memory_budget()
+        sub = row.row(align=True)
+        sub.alert = bool(budget) and usage > budget
+        sub.label(text=f"~{format_bytes(usage)}" + (f" / {format_bytes(budget)}" if budget else ""), icon="MEMORY")
+        if budget:
+            sub.operator("linkeditor.fit_budget", text="", icon="TRIA_DOWN_BAR")
+        if _status["text"]:
+            row = layout.row(align=True)
+            row.alert = _status["level"] == 'ERROR'
+            row.label(text=_status["text"], icon="ERROR" if _status["level"] != 'INFO' else "INFO")
+            row.operator("linkeditor.clear_status", text="", icon="X", emboss=False)
+        progress = loader_progress()
+        if progress:
+            done, total, fraction, current = progress
+            row = layout.row(align=True)
+            name = os.path.basename(bpy.path.abspath(current)) if current else ""
+            row.progress(factor=fraction, type='BAR', text=f"Loading {done + 1}/{total} {name}")
+            row.operator("linkeditor.cancel_loading", text="", icon="X")
+        for r in rows:
+            live_fp = r["filepath"]
             expanded = expanded_states.get(live_fp, False)
             row = layout.row(align=True)
+            row.operator("linkeditor.toggle_select", text="",
+                         icon="CHECKBOX_HLT" if live_fp in selected_libraries else "CHECKBOX_DEHLT",
+                         emboss=False).filepath = live_fp
             row.operator("linkeditor.toggle_expand", text="",
                          icon="TRIA_DOWN" if expanded else "TRIA_RIGHT",
                          emboss=False).filepath = live_fp
-            row.label(text=os.path.basename(abs_fp))
-            is_loaded = link_active_states.get(live_fp, True)
+            for _ in range(r["depth"]):
+                row.label(text="", icon="BLANK1")
+            row.label(text=r["name"], icon="LIBRARY_DATA_INDIRECT" if r["indirect"] else "NONE")
+            if r["duplicates"]:
+                sub = row.row(align=True)
+                sub.alert = True
+                sub.operator("linkeditor.merge_duplicates", text="", icon="DUPLICATE").filepath = live_fp
             row.operator("linkeditor.load_and_unload", text="",
-                         icon="HIDE_OFF" if is_loaded else "HIDE_ON").filepath = live_fp
-            is_lo = resolution_status.get(live_fp, {}).get("status") == "low" or (live_fp not in resolution_status and is_lo_file(live_fp))
+                         icon="HIDE_OFF" if r["is_loaded"] else "HIDE_ON").filepath = live_fp
             row.operator("linkeditor.switch_mode", text="",
-                         icon="SPLIT_HORIZONTAL" if is_lo else "VIEW_ORTHO").original_filepath = live_fp
-            if is_lo:
-                hi_r = resolution_status.get(live_fp, {}).get("high_res_for_render", False)
+                         icon="SPLIT_HORIZONTAL" if r["is_lo"] else "VIEW_ORTHO").original_filepath = live_fp
+            if r["is_lo"]:
                 row.operator("linkeditor.render_resolution", text="",
-                             icon="ANTIALIASED" if hi_r else "ALIASED").filepath = live_fp
+                             icon="ANTIALIASED" if r["hi_render"] else "ALIASED").filepath = live_fp
+                row.operator("linkeditor.switch_instances", text="",
+                             icon="OUTLINER_OB_GROUP_INSTANCE").filepath = live_fp
             else:
                 row.label(text="", icon="ANTIALIASED")
+                row.label(text="", icon="BLANK1")
             row.operator("linkeditor.relocate", text="", icon="GRAPH").original_filepath = live_fp
-            row.operator("linkeditor.reload", text="", icon="FILE_REFRESH").filepath = live_fp
+            sub = row.row(align=True)
+            sub.alert = r["stale"]
+            sub.operator("linkeditor.reload", text="", icon="FILE_REFRESH").filepath = live_fp
             row.operator("linkeditor.remove", text="", icon="X").filepath = live_fp
             if expanded:
                 layout.row().label(text=live_fp)
+                for line in r["details"]:
+                    layout.row().label(text=line)
+                for kind, part_name, loaded in r["parts"]:
+                    row = layout.row(align=True)
+                    row.label(text="", icon="BLANK1")
+                    op = row.operator("linkeditor.toggle_part", text="", emboss=False,
+                                      icon="CHECKBOX_HLT" if loaded else "CHECKBOX_DEHLT")
+                    op.filepath = live_fp
+                    op.kind = kind
+                    op.part = part_name
+                    row.label(text=part_name,
+                              icon="OUTLINER_COLLECTION" if kind == 'COLLECTION' else "OBJECT_DATA")
+
+        layout.separator()
+        box = layout.box()
+        box.label(text="Selected:")
+        row = box.row(align=True)
+        for action, icon in (('UNLOAD', "HIDE_ON"), ('LOAD', "HIDE_OFF"), ('RELOAD', "FILE_REFRESH"),
+                             ('TO_LOW', "SPLIT_HORIZONTAL"), ('TO_HIGH', "VIEW_ORTHO"),
+                             ('RENDER_HI_ON', "ANTIALIASED"), ('RENDER_HI_OFF', "ALIASED")):
+            op = row.operator("linkeditor.batch", text="", icon=icon)
+            op.action = action
+            op.target = 'SELECTED'
+        row = box.row(align=True)
+        op = row.operator("linkeditor.batch", text="All Lo-res", icon="SPLIT_HORIZONTAL")
+        op.action = 'TO_LOW'
+        op.target = 'LO_CAPABLE'
+        op = row.operator("linkeditor.batch", text="Reload All", icon="FILE_REFRESH")
+        op.action = 'RELOAD'
+        op.target = 'ALL'
+        row.operator("linkeditor.reload_changed", text="Reload Changed", icon="FILE_REFRESH")
+        op = row.operator("linkeditor.batch", text="By Pattern", icon="FILTER")
+        op.target = 'GLOB'
+        row.operator("linkeditor.repath", text="Repath", icon="FILE_FOLDER")
+
+        row = box.row(align=True)
+        progress = inspection_progress()
+        if progress:
+            row.label(text=f"Inspecting {progress[0]}/{progress[1]}", icon="TIME")
+            row.operator("linkeditor.cancel_inspection", text="", icon="X")
+        else:
+            row.operator("linkeditor.inspect_libraries", text="Inspect", icon="VIEWZOOM").target = 'LINKED'
+            row.operator("linkeditor.inspect_libraries", text="Inspect Folder",
+                         icon="FILE_FOLDER").target = 'DIRECTORY'
+
+        row = box.row(align=True)
+        progress = proxy_progress()
+        if progress:
+            row.label(text=f"Proxies {progress[0]}/{progress[1]}", icon="TIME")
+            row.operator("linkeditor.cancel_proxies", text="", icon="X")
+        else:
+            row.operator("linkeditor.generate_proxies", text="Make Proxies", icon="MOD_DECIM").target = 'LINKED'
+            row.operator("linkeditor.generate_proxies", text="Proxies for Folder",
+                         icon="FILE_FOLDER").target = 'DIRECTORY'
+            if _proxies["summary"]:
+                row = box.row()
+                row.alert = bool(_proxies["errors"])
+                row.label(text=f"Proxies: {_proxies['summary']}", icon="ERROR" if _proxies["errors"] else "CHECKMARK")
+
+        settings = context.scene.link_manager
+        box = layout.box()
+        box.prop(settings, "lod_mode")
+        if settings.lod_mode != 'OFF':
+            if settings.lod_mode == 'DISTANCE':
+                box.prop(settings, "lod_distance")
+            else:
+                box.prop(settings, "lod_screen_size")
+            box.prop(settings, "lod_frustum_cull")
+            box.prop(settings, "lod_live")
 
         layout.separator()
         layout.operator("wm.link", text="Add Link", icon="ADD")
 
 # ### Registration
 classes = (
+    LINKEDITOR_AP_preferences,
+    LINKEDITOR_PG_library_state,
+    LINKEDITOR_PG_settings,
     LINKEDITOR_OT_toggle_expand,
+    LINKEDITOR_OT_toggle_part,
     LINKEDITOR_OT_load_and_unload,
     LINKEDITOR_OT_relocate,
+    LINKEDITOR_OT_repath,
     LINKEDITOR_OT_reload,
     LINKEDITOR_OT_remove,
+    LINKEDITOR_OT_merge_duplicates,
     LINKEDITOR_OT_switch_mode,
     LINKEDITOR_OT_render_resolution,
+    LINKEDITOR_OT_switch_instances,
+    LINKEDITOR_OT_reload_changed,
+    LINKEDITOR_OT_inspect_libraries,
+    LINKEDITOR_OT_cancel_inspection,
+    LINKEDITOR_OT_generate_proxies,
+    LINKEDITOR_OT_cancel_proxies,
+    LINKEDITOR_OT_cancel_loading,
+    LINKEDITOR_OT_clear_status,
+    LINKEDITOR_OT_fit_budget,
+    LINKEDITOR_OT_toggle_select,
+    LINKEDITOR_OT_batch,
     LINKEDITOR_PT_panel,
 )
 
@@ -745,15 +3390,28 @@ def register():
             bpy.utils.register_class(c)
         except ValueError:
             pass
+    bpy.types.Scene.link_manager = bpy.props.PointerProperty(type=LINKEDITOR_PG_settings)
     for handler in bpy.app.handlers.load_post[:]:
         if handler.__name__ == 'linkeditor_load_post':
             bpy.app.handlers.load_post.remove(handler)
+    for handler in bpy.app.handlers.save_pre[:]:
+        if handler.__name__ == 'linkeditor_save_pre':
+            bpy.app.handlers.save_pre.remove(handler)
+    for handler in bpy.app.handlers.save_post[:]:
+        if handler.__name__ == 'linkeditor_save_post':
+            bpy.app.handlers.save_post.remove(handler)
     for handler in bpy.app.handlers.render_pre[:]:
         if handler.__name__ == 'prepare_render':
             bpy.app.handlers.render_pre.remove(handler)
     for handler in bpy.app.handlers.render_post[:]:
         if handler.__name__ == 'restore_render':
             bpy.app.handlers.render_post.remove(handler)
+    for handler in bpy.app.handlers.render_init[:]:
+        if handler.__name__ == 'prepare_render':
+            bpy.app.handlers.render_init.remove(handler)
+    for handler in bpy.app.handlers.render_complete[:]:
+        if handler.__name__ == 'restore_render':
+            bpy.app.handlers.render_complete.remove(handler)
     for handler in bpy.app.handlers.render_cancel[:]:
         if handler.__name__ == 'restore_render':
             bpy.app.handlers.render_cancel.remove(handler)
@@ -761,12 +3419,27 @@ def register():
         if handler.__name__ == 'monitor_libraries':
             bpy.app.handlers.depsgraph_update_post.remove(handler)
     bpy.app.handlers.load_post.append(linkeditor_load_post)
-    bpy.app.handlers.render_pre.append(prepare_render)
-    bpy.app.handlers.render_post.append(restore_render)
+    bpy.app.handlers.save_pre.append(linkeditor_save_pre)
+    bpy.app.handlers.save_post.append(linkeditor_save_post)
+    bpy.app.handlers.render_init.append(prepare_render)
+    bpy.app.handlers.render_complete.append(restore_render)
     bpy.app.handlers.render_cancel.append(restore_render)
     bpy.app.handlers.depsgraph_update_post.append(monitor_libraries)
 
 def unregister():
+    cancel_inspection()
+    cancel_proxy_generation()
+    cancel_library_loads()
+    stop_library_watch()
+    for timer in (_flush_library_monitor, _run_prewarm, _run_live_lod, _run_budget_check, _run_stat_refresh):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+    stat_cache.shutdown()
+    catalog_index.shutdown()
+    variant_index.shutdown()
+    if hasattr(bpy.types.Scene, "link_manager"):
+        del bpy.types.Scene.link_manager
+    close_manifest()
     for c in reversed(classes):
         try:
             bpy.utils.unregister_class(c)
@@ -775,12 +3448,24 @@ def unregister():
     for handler in bpy.app.handlers.load_post[:]:
         if handler.__name__ == 'linkeditor_load_post':
             bpy.app.handlers.load_post.remove(handler)
+    for handler in bpy.app.handlers.save_pre[:]:
+        if handler.__name__ == 'linkeditor_save_pre':
+            bpy.app.handlers.save_pre.remove(handler)
+    for handler in bpy.app.handlers.save_post[:]:
+        if handler.__name__ == 'linkeditor_save_post':
+            bpy.app.handlers.save_post.remove(handler)
     for handler in bpy.app.handlers.render_pre[:]:
         if handler.__name__ == 'prepare_render':
             bpy.app.handlers.render_pre.remove(handler)
     for handler in bpy.app.handlers.render_post[:]:
         if handler.__name__ == 'restore_render':
             bpy.app.handlers.render_post.remove(handler)
+    for handler in bpy.app.handlers.render_init[:]:
+        if handler.__name__ == 'prepare_render':
+            bpy.app.handlers.render_init.remove(handler)
+    for handler in bpy.app.handlers.render_complete[:]:
+        if handler.__name__ == 'restore_render':
+            bpy.app.handlers.render_complete.remove(handler)
     for handler in bpy.app.handlers.render_cancel[:]:
         if handler.__name__ == 'restore_render':
             bpy.app.handlers.render_cancel.remove(handler)
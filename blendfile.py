@@ -0,0 +1,221 @@
+"""Read-only catalog of the datablocks stored in a .blend file.
+
+Parses the file header, the block headers and the SDNA directly, so a
+library can be inspected without Blender loading it. Uncompressed files are
+memory-mapped and read in place; zstd (Blender 3.0+) and gzip (older)
+compressed files are decompressed into memory first.
+"""
+
+import gzip
+import mmap
+import struct
+
+try:
+    import zstandard
+except ImportError:  # bundled with Blender, may be missing elsewhere
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Two-letter ID codes -> bpy.data collection names
+ID_CODES = {
+    b"GR": "collections",
+    b"OB": "objects",
+    b"ME": "meshes",
+    b"MA": "materials",
+    b"IM": "images",
+    b"LA": "lights",
+    b"CA": "cameras",
+    b"AR": "armatures",
+    b"CU": "curves",
+    b"LT": "lattices",
+    b"MB": "metaballs",
+    b"TX": "texts",
+    b"GD": "grease_pencils",
+    b"WO": "worlds",
+    b"NT": "node_groups",
+    b"AC": "actions",
+    b"SC": "scenes",
+}
+
+
+class BlendFileError(Exception):
+    """The file is not a .blend file this reader understands."""
+
+
+def _read_buffer(filepath):
+    """Return (buffer, close) for the uncompressed file contents."""
+    f = open(filepath, "rb")
+    try:
+        magic = f.read(4)
+        f.seek(0)
+        if magic == ZSTD_MAGIC:
+            if zstandard is None:
+                raise BlendFileError("zstd-compressed .blend needs the 'zstandard' module")
+            with zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+                data = reader.read()
+            f.close()
+            return data, lambda: None
+        if magic[:2] == GZIP_MAGIC:
+            data = gzip.decompress(f.read())
+            f.close()
+            return data, lambda: None
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        f.close()
+        raise BlendFileError(str(e)) from e
+
+    def close():
+        buf.close()
+        f.close()
+    return buf, close
+
+
+def _parse_header(buf):
+    """Return (header size, pointer size, endian prefix, block header struct, its field order)."""
+    if buf[:7] != b"BLENDER":
+        raise BlendFileError("not a .blend file")
+    marker = buf[7:8]
+    if marker in (b"_", b"-"):
+        # Legacy 12-byte header: BLENDER + pointer size + endianness + version
+        ptr_size = 8 if marker == b"-" else 4
+        endian = "<" if buf[8:9] == b"v" else ">"
+        bhead = struct.Struct(endian + ("4siQii" if ptr_size == 8 else "4siIii"))
+        return 12, ptr_size, endian, bhead, ("code", "len", "old", "sdna", "nr")
+    # Blender 5.0+: BLENDER + header size + '-' + format version + endianness + version
+    try:
+        header_size = int(buf[7:9])
+        file_format = int(buf[10:12])
+    except ValueError:
+        raise BlendFileError("unrecognized .blend header")
+    if file_format != 1:
+        raise BlendFileError(f"unsupported .blend format version {file_format}")
+    endian = "<" if buf[12:13] == b"v" else ">"
+    bhead = struct.Struct(endian + "4siQqq")
+    return header_size, 8, endian, bhead, ("code", "sdna", "old", "len", "nr")
+
+
+def _iter_blocks(buf, offset, bhead, fields):
+    """Yield (code, data offset, data length, sdna index) for every block up to ENDB."""
+    i_code, i_len, i_sdna = fields.index("code"), fields.index("len"), fields.index("sdna")
+    size = len(buf)
+    while offset + bhead.size <= size:
+        head = bhead.unpack_from(buf, offset)
+        code = head[i_code]
+        if code == b"ENDB":
+            return
+        data = offset + bhead.size
+        length = head[i_len]
+        yield code, data, length, head[i_sdna]
+        offset = data + length
+
+
+def _c_string(buf, start, limit):
+    end = buf.find(b"\0", start, start + limit)
+    return bytes(buf[start:end if end != -1 else start + limit]).decode("utf-8", "replace")
+
+
+class _SDNA:
+    """Just enough of the DNA1 block to compute field offsets."""
+
+    def __init__(self, buf, start, endian, ptr_size):
+        self.ptr_size = ptr_size
+        pos = start
+        if buf[pos:pos + 8] != b"SDNANAME":
+            raise BlendFileError("malformed DNA1 block")
+        pos += 8
+        self.names, pos = self._strings(buf, pos, endian)
+        pos = self._expect(buf, start, pos, b"TYPE")
+        self.types, pos = self._strings(buf, pos, endian)
+        pos = self._expect(buf, start, pos, b"TLEN")
+        count = len(self.types)
+        self.type_sizes = struct.unpack_from(f"{endian}{count}H", buf, pos)
+        pos = self._expect(buf, start, pos + 2 * count, b"STRC")
+        (nr_structs,) = struct.unpack_from(endian + "i", buf, pos)
+        pos += 4
+        self.structs = {}
+        for _ in range(nr_structs):
+            type_index, nr_fields = struct.unpack_from(endian + "hh", buf, pos)
+            pos += 4
+            fields = struct.unpack_from(f"{endian}{2 * nr_fields}h", buf, pos)
+            pos += 4 * nr_fields
+            self.structs[self.types[type_index]] = list(zip(fields[::2], fields[1::2]))
+
+    @staticmethod
+    def _strings(buf, pos, endian):
+        (count,) = struct.unpack_from(endian + "i", buf, pos)
+        pos += 4
+        out = []
+        for _ in range(count):
+            end = buf.find(b"\0", pos)
+            out.append(bytes(buf[pos:end]).decode("ascii", "replace"))
+            pos = end + 1
+        return out, pos
+
+    @staticmethod
+    def _expect(buf, start, pos, tag):
+        # sections are 4-byte aligned relative to the start of the block
+        pos = start + ((pos - start + 3) & ~3)
+        if buf[pos:pos + 4] != tag:
+            raise BlendFileError("malformed DNA1 block")
+        return pos + 4
+
+    def _field_size(self, type_index, name):
+        if name.startswith("*") or name.startswith("(*"):
+            size = self.ptr_size
+        else:
+            size = self.type_sizes[type_index]
+        for dim in name.split("[")[1:]:
+            size *= int(dim.rstrip("]"))
+        return size
+
+    def field(self, struct_name, field_name):
+        """Return (offset, size) of a field, matching the name without array suffix."""
+        offset = 0
+        for type_index, name_index in self.structs.get(struct_name, ()):
+            name = self.names[name_index]
+            size = self._field_size(type_index, name)
+            if name.split("[")[0] == field_name:
+                return offset, size
+            offset += size
+        raise BlendFileError(f"{struct_name}.{field_name} not found in SDNA")
+
+
+def read_catalog(filepath):
+    """List the local datablocks of a .blend file.
+
+    Returns {bpy.data collection name: [datablock names]} in file order, plus
+    "libraries": [paths of libraries this file links from].
+    """
+    buf, close = _read_buffer(filepath)
+    try:
+        header_size, ptr_size, endian, bhead, fields = _parse_header(buf)
+        blocks = list(_iter_blocks(buf, header_size, bhead, fields))
+        dna = next((b for b in blocks if b[0] == b"DNA1"), None)
+        if dna is None:
+            raise BlendFileError("no DNA1 block")
+        sdna = _SDNA(buf, dna[1], endian, ptr_size)
+        name_offset, name_size = sdna.field("ID", "name")
+        try:
+            lib_path_offset, lib_path_size = sdna.field("Library", "filepath")
+        except BlendFileError:
+            lib_path_offset, lib_path_size = sdna.field("Library", "name")
+
+        catalog = {"libraries": []}
+        for code, data, length, _ in blocks:
+            if code[2:] != b"\0\0":
+                continue
+            if code[:2] == b"LI":
+                catalog["libraries"].append(_c_string(buf, data + lib_path_offset, lib_path_size))
+                continue
+            dt = ID_CODES.get(code[:2])
+            if dt is None or length < name_offset + 2:
+                continue
+            name = _c_string(buf, data + name_offset, min(name_size, length - name_offset))
+            catalog.setdefault(dt, []).append(name[2:])
+        return catalog
+    except (struct.error, IndexError) as e:
+        raise BlendFileError(f"truncated or corrupt .blend file: {e}") from e
+    finally:
+        close()
@@ -0,0 +1,144 @@
+"""Library catalogs read off the UI thread.
+
+A catalog ({bpy.data collection name: [names]}) comes from the manifest
+database when it still holds a valid entry, else from blendfile.py, and is
+kept in memory together with the Lo/Hi pairing stored next to it. Callers
+pass the (size, mtime_ns) they got from the stat cache; a lookup whose key
+is unknown or outdated queues a read on a small thread pool and returns None,
+so the caller never stats, hashes or parses a file itself. Database access
+happens only on the pool, one connection per thread. Kept free of bpy.
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import blendfile
+from . import manifest
+
+
+class CatalogIndex:
+    """(catalog, pairing) per absolute library path, keyed on the file's size and mtime."""
+
+    def __init__(self, db_path=None, workers=2):
+        self.db_path = db_path
+        self.workers = workers
+        self.generation = 0  # bumped whenever a read finishes
+        self._entries = {}  # path -> ((size, mtime_ns), catalog, pairing)
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+
+    def lookup(self, path, key, wait=False):
+        """(catalog, pairing) of path for stat key, or None while it is read in the background.
+
+        With wait, the read runs on the pool and the caller blocks on it.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1], entry[2]
+        if wait:
+            executor = self._pool()
+            with self._lock:
+                self._inflight.add(path)
+            return executor.submit(self._read, path, key).result()
+        self._submit(path, key)
+        return None
+
+    def store_pairing(self, path, key, pairing):
+        """Remember pairing for path's current entry and persist it in the background."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != key:
+                return
+            self._entries[path] = (key, entry[1], pairing)
+        try:
+            self._pool().submit(self._write_pairing, path, pairing)
+        except RuntimeError:  # shut down meanwhile
+            pass
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    @property
+    def pending(self):
+        return len(self._inflight)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._inflight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="catalogs")
+            return self._executor
+
+    def _submit(self, path, key):
+        with self._lock:
+            if path in self._inflight:
+                return
+            self._inflight.add(path)
+        try:
+            self._pool().submit(self._read, path, key)
+        except RuntimeError:  # shut down meanwhile
+            with self._lock:
+                self._inflight.discard(path)
+
+    def _conn(self):
+        if not hasattr(self._local, "conn"):
+            try:
+                self._local.conn = manifest.open_store(self.db_path) if self.db_path else None
+            except (sqlite3.Error, OSError):
+                self._local.conn = None
+        return self._local.conn
+
+    def _read(self, path, key):
+        try:
+            return self._read_entry(path, key)
+        finally:
+            with self._lock:
+                self._inflight.discard(path)
+
+    def _read_entry(self, path, key):
+        conn = self._conn()
+        entry = None
+        if conn is not None:
+            try:
+                entry = manifest.lookup(conn, path)
+            except sqlite3.Error:
+                entry = None
+        if entry:
+            catalog, pairing = entry["inventory"], entry["pairing"]
+        else:
+            try:
+                catalog = blendfile.read_catalog(path)
+            except (blendfile.BlendFileError, OSError):
+                catalog = {}
+            pairing = None
+            if conn is not None and catalog:
+                try:
+                    manifest.store(conn, path, catalog, signature=(key[0], key[1], None))
+                except (sqlite3.Error, OSError):
+                    pass
+        with self._lock:
+            self._entries[path] = (key, catalog, pairing)
+            self.generation += 1
+        return catalog, pairing
+
+    def _write_pairing(self, path, pairing):
+        conn = self._conn()
+        if conn is not None:
+            try:
+                manifest.store_pairing(conn, path, pairing)
+            except sqlite3.Error:
+                pass
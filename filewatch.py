@@ -0,0 +1,138 @@
+"""Change notification for library files.
+
+On Linux an inotify instance watches the directories that contain the
+libraries and reports which files were written, moved or deleted. Elsewhere
+create_watcher() returns None and callers fall back to polling file stamps.
+inotify only sees writes made through the local kernel, so files on network
+filesystems (network_paths()) must be polled as well.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import re
+import struct
+import sys
+import time
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB
+
+_EVENT = struct.Struct("iIII")
+
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "ncpfs", "afs", "ceph", "glusterfs",
+                       "lustre", "9p", "davfs", "fuse.sshfs", "fuse.rclone", "fuse.glusterfs"}
+MOUNTS_TTL = 60.0
+_mounts = {"time": None, "entries": []}
+
+
+class InotifyWatcher:
+    """Directory-level inotify watches, polled without blocking."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}  # directory -> watch descriptor
+        self._wds = {}  # watch descriptor -> directory
+
+    def watch(self, paths):
+        """Watch the directories containing paths, dropping watches no longer needed."""
+        wanted = {os.path.dirname(p) for p in paths}
+        for directory in set(self._dirs) - wanted:
+            wd = self._dirs.pop(directory)
+            self._wds.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+        for directory in wanted - set(self._dirs):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd >= 0:
+                self._dirs[directory] = wd
+                self._wds[wd] = directory
+
+    def poll(self):
+        """Return the set of file paths with events since the last poll."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EINTR):
+                    break
+                raise
+            if not data:
+                break
+            pos = 0
+            while pos + _EVENT.size <= len(data):
+                wd, _mask, _cookie, length = _EVENT.unpack_from(data, pos)
+                pos += _EVENT.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                directory = self._wds.get(wd)
+                if directory and name:
+                    changed.add(os.path.join(directory, os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher():
+    """An InotifyWatcher where the platform supports it, else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError):
+        return None
+
+
+def _mount_entries():
+    """[(mount point, fstype)] from /proc/self/mounts, deepest first; cached for MOUNTS_TTL."""
+    now = time.monotonic()
+    if _mounts["time"] is None or now - _mounts["time"] >= MOUNTS_TTL:
+        entries = []
+        try:
+            with open("/proc/self/mounts", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 3:
+                        # spaces and tabs in mount points are octal-escaped
+                        point = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1])
+                        entries.append((point, fields[2]))
+        except OSError:
+            pass
+        _mounts["entries"] = sorted(entries, key=lambda e: len(e[0]), reverse=True)
+        _mounts["time"] = now
+    return _mounts["entries"]
+
+
+def network_paths(paths):
+    """The subset of paths that live on a network filesystem (empty where it cannot be told)."""
+    if not sys.platform.startswith("linux"):
+        return set()
+    entries = _mount_entries()
+    remote = set()
+    for path in paths:
+        for point, fstype in entries:
+            if path == point or path.startswith(point.rstrip("/") + "/"):
+                if fstype in NETWORK_FILESYSTEMS:
+                    remote.add(path)
+                break
+    return remote
@@ -0,0 +1,47 @@
+"""Background worker: list the datablocks of .blend libraries.
+
+Run by workers.BlenderPool as
+    blender -b --factory-startup --python inspect_worker.py -- OUT.json PATH...
+and writes {path: {"inventory": {...}, "signature": [size, mtime_ns, hash]}}
+or {path: {"error": "..."}} to OUT.json.
+"""
+
+import json
+import os
+import sys
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import blendfile  # noqa: E402
+import manifest  # noqa: E402
+
+ID_TYPES = ('collections', 'objects', 'meshes', 'materials', 'images', 'lights', 'cameras',
+            'armatures', 'curves', 'lattices', 'metaballs', 'texts', 'grease_pencils',
+            'worlds', 'node_groups', 'actions', 'scenes')
+
+
+def inspect(path):
+    with bpy.data.libraries.load(path, link=True) as (src, _dst):
+        inventory = {dt: list(getattr(src, dt)) for dt in ID_TYPES if getattr(src, dt, None)}
+    try:
+        inventory["libraries"] = blendfile.read_catalog(path).get("libraries", [])
+    except blendfile.BlendFileError:
+        inventory["libraries"] = []
+    return {"inventory": inventory, "signature": list(manifest.file_signature(path))}
+
+
+def main(argv):
+    out_path, paths = argv[0], argv[1:]
+    results = {}
+    for path in paths:
+        try:
+            results[path] = inspect(path)
+        except Exception as e:
+            results[path] = {"error": str(e)}
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(results, f)
+
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:])
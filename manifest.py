@@ -0,0 +1,147 @@
+"""Persistent on-disk cache of library inventories.
+
+One SQLite table keyed on the absolute library path. An entry is valid while
+the file's size and mtime are unchanged. A changed mtime is always a miss: a
+renamed datablock keeps the file size (ID names are fixed-width) and only
+changes bytes deep inside the file, which a sampled hash would not see.
+Kept free of bpy so background workers can write to it too.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+HASH_SAMPLE = 1 << 20  # bytes hashed from each end of the file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS libraries (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    inventory TEXT NOT NULL,
+    pairing TEXT,
+    updated REAL NOT NULL
+)
+"""
+
+PROXY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS proxies (
+    target TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+def quick_hash(path, size=None):
+    """blake2b of the file size plus its first and last HASH_SAMPLE bytes."""
+    if size is None:
+        size = os.path.getsize(path)
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(HASH_SAMPLE))
+        if size > 2 * HASH_SAMPLE:
+            f.seek(size - HASH_SAMPLE)
+            h.update(f.read(HASH_SAMPLE))
+        elif size > HASH_SAMPLE:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def file_signature(path, with_hash=True):
+    """(size, mtime_ns, hash or None) for path; raises OSError if it cannot be read."""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, quick_hash(path, st.st_size) if with_hash else None
+
+
+def open_store(db_path):
+    """Open (creating if needed) the manifest database at db_path."""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(SCHEMA)
+    conn.execute(PROXY_SCHEMA)
+    conn.commit()
+    return conn
+
+
+def lookup(conn, path):
+    """Return {"inventory": ..., "pairing": ...} for a still-valid entry, else None."""
+    row = conn.execute(
+        "SELECT size, mtime_ns, inventory, pairing FROM libraries WHERE path = ?", (path,)
+    ).fetchone()
+    if row is None:
+        return None
+    size, mtime_ns, inventory, pairing = row
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if st.st_size != size or st.st_mtime_ns != mtime_ns:
+        return None
+    return {"inventory": json.loads(inventory), "pairing": json.loads(pairing) if pairing else None}
+
+
+def store(conn, path, inventory, signature=None):
+    """Record the inventory of path.
+
+    signature defaults to the file's current one; its hash may be None when
+    the caller only has a cached (size, mtime_ns), so nothing is read here.
+    """
+    size, mtime_ns, digest = signature or file_signature(path)
+    conn.execute(
+        "INSERT OR REPLACE INTO libraries (path, size, mtime_ns, hash, inventory, pairing, updated) "
+        "VALUES (?, ?, ?, ?, ?, (SELECT pairing FROM libraries WHERE path = ? AND size = ? AND mtime_ns = ?), ?)",
+        (path, size, mtime_ns, digest or "", json.dumps(inventory), path, size, mtime_ns, time.time()),
+    )
+    conn.commit()
+
+
+def store_pairing(conn, path, pairing):
+    """Attach a Lo/Hi mapping to an existing entry."""
+    conn.execute("UPDATE libraries SET pairing = ? WHERE path = ?", (json.dumps(pairing), path))
+    conn.commit()
+
+
+def proxy_records(conn):
+    """{target: (source, size, mtime_ns, hash, settings)} of every generated proxy."""
+    rows = conn.execute("SELECT target, source, size, mtime_ns, hash, settings FROM proxies")
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def store_proxy(conn, source, target, signature, settings):
+    """Record that target was generated from source (with its signature at the time) using settings."""
+    size, mtime_ns, digest = signature
+    conn.execute(
+        "INSERT OR REPLACE INTO proxies (target, source, size, mtime_ns, hash, settings, updated) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (target, source, size, mtime_ns, digest, json.dumps(settings, sort_keys=True), time.time()),
+    )
+    conn.commit()
+
+
+def proxy_current(record, source, target, settings):
+    """True if record says target was made from source's current content with the same settings.
+
+    Touches the disk; meant for worker threads.
+    """
+    if record is None:
+        return False
+    rec_source, size, mtime_ns, _digest, rec_settings = record
+    if rec_source != source or rec_settings != json.dumps(settings, sort_keys=True):
+        return False
+    try:
+        if not os.path.isfile(target):
+            return False
+        st = os.stat(source)
+    except OSError:
+        return False
+    # like lookup(): a sampled hash cannot vouch for a source whose mtime moved
+    return st.st_size == size and st.st_mtime_ns == mtime_ns
@@ -0,0 +1,103 @@
+"""Background worker: write low-res proxies of hi-res .blend libraries.
+
+Run by workers.BlenderPool as
+    blender -b --factory-startup --python proxy_worker.py -- OUT.json OPTIONS PATH...
+where OPTIONS is a JSON object {"rules", "level", "ratio", "max_texture"}.
+Each PATH is opened, reduced and saved under the name the naming rules give
+its low-res level, keeping every datablock name so switching a library
+between the two files relinks the same datablocks. Writes
+{path: {"target": ..., "signature": [size, mtime_ns, hash]}} or
+{path: {"error": "..."}} to OUT.json.
+"""
+
+import json
+import os
+import sys
+
+import bmesh
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import manifest  # noqa: E402
+import variants  # noqa: E402
+
+# modifiers that only add detail or smoothing; the silhouette survives without them
+DETAIL_MODIFIERS = {'SUBSURF', 'MULTIRES', 'REMESH', 'BEVEL', 'TRIANGULATE', 'WEIGHTED_NORMAL',
+                    'SMOOTH', 'CORRECTIVE_SMOOTH', 'LAPLACIANSMOOTH'}
+MIN_FACES = 64  # meshes this small are kept as they are
+
+
+def strip_modifiers():
+    for obj in bpy.data.objects:
+        if obj.library is None:
+            for mod in [m for m in obj.modifiers if m.type in DETAIL_MODIFIERS]:
+                obj.modifiers.remove(mod)
+
+
+def decimate_meshes(ratio):
+    if ratio >= 1.0:
+        return
+    scene = bpy.context.scene
+    for me in list(bpy.data.meshes):
+        if (me.library is not None or not me.users or me.shape_keys is not None
+                or len(me.polygons) < MIN_FACES):
+            continue
+        tmp = bpy.data.objects.new("__linkmanager_decimate", me)
+        scene.collection.objects.link(tmp)
+        mod = tmp.modifiers.new("Decimate", 'DECIMATE')
+        mod.ratio = ratio
+        mod.use_collapse_triangulate = False
+        reduced = bpy.data.meshes.new_from_object(tmp.evaluated_get(bpy.context.evaluated_depsgraph_get()))
+        bpy.data.objects.remove(tmp)
+        # write the geometry back into the original mesh so its name, users and materials stay
+        bm = bmesh.new()
+        bm.from_mesh(reduced)
+        bm.to_mesh(me)
+        bm.free()
+        bpy.data.meshes.remove(reduced)
+
+
+def downscale_images(max_size):
+    if max_size <= 0:
+        return
+    for img in bpy.data.images:
+        if img.library is not None or img.source != 'FILE':
+            continue
+        width, height = img.size
+        if not img.has_data or max(width, height) <= max_size:
+            continue
+        scale = max_size / max(width, height)
+        img.scale(max(1, round(width * scale)), max(1, round(height * scale)))
+        img.pack()
+
+
+def make_proxy(path, target, options):
+    if os.path.normcase(os.path.abspath(target)) == os.path.normcase(os.path.abspath(path)):
+        raise ValueError("naming rules give no low-res name for this file")
+    signature = manifest.file_signature(path)
+    bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
+    strip_modifiers()
+    decimate_meshes(options.get("ratio", 0.25))
+    downscale_images(options.get("max_texture", 512))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    bpy.ops.wm.save_as_mainfile(filepath=target, copy=True, compress=True, relative_remap=True)
+    return {"target": target, "signature": list(signature)}
+
+
+def main(argv):
+    out_path, options, paths = argv[0], json.loads(argv[1]), argv[2:]
+    rules = variants.NamingRules.parse(options.get("rules", variants.DEFAULT_RULES))
+    level = options.get("level", 1)
+    results = {}
+    for path in paths:
+        try:
+            folder, stem, _ = rules.classify(path)
+            results[path] = make_proxy(path, rules.candidate(folder, stem, level), options)
+        except Exception as e:
+            results[path] = {"error": str(e)}
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(results, f)
+
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:])
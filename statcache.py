@@ -0,0 +1,118 @@
+"""Non-blocking cache of file stat results.
+
+Lookups never touch the filesystem unless asked to wait: they return what is
+cached, even past its TTL, and queue a refresh on a small thread pool. Meant
+for library paths on network storage, where one stat can take seconds.
+Kept free of bpy; refreshes run on worker threads, lookups on any thread.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _stat_key(st):
+    return None if st is None else (st.st_size, st.st_mtime_ns, st.st_mode)
+
+
+class StatCache:
+    """os.stat results per path, refreshed in the background once older than ttl seconds."""
+
+    def __init__(self, ttl=30.0, workers=4):
+        self.ttl = ttl
+        self.workers = workers
+        self.generation = 0  # bumped whenever a refresh changes a result
+        self._entries = {}  # path -> (monotonic time checked, stat_result or None)
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def lookup(self, path, wait=False):
+        """(known, stat_result or None if missing).
+
+        Unknown or stale entries are refreshed in the background; with wait,
+        an unknown entry is stat'ed on the calling thread instead.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None and wait:
+            return True, self._refresh(path)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            self._submit(path)
+        return (False, None) if entry is None else (True, entry[1])
+
+    def stat(self, path, wait=False):
+        """Cached stat_result of path, or None if it is missing or not known yet."""
+        return self.lookup(path, wait)[1]
+
+    def exists(self, path, default=False, wait=False):
+        """Whether path exists according to the cache; default while unknown."""
+        known, st = self.lookup(path, wait)
+        return st is not None if known else default
+
+    def prefetch(self, paths, max_age=None):
+        """Queue a refresh for each path that is unknown or older than max_age (default: ttl) seconds."""
+        max_age = self.ttl if max_age is None else max_age
+        now = time.monotonic()
+        with self._lock:
+            stale = [p for p in paths if p not in self._entries or now - self._entries[p][0] >= max_age]
+        for path in stale:
+            self._submit(path)
+
+    def stat_many(self, paths):
+        """Stat every path now, in parallel on the pool, and wait: {path: stat_result or None}."""
+        paths = list(dict.fromkeys(paths))
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="statcache")
+            executor = self._executor
+            self._inflight.update(paths)
+        futures = [executor.submit(self._refresh, p) for p in paths]
+        return {p: f.result() for p, f in zip(paths, futures)}
+
+    def invalidate(self, path=None):
+        """Forget path (or everything), so the next lookup refreshes it."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    @property
+    def pending(self):
+        return len(self._inflight)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._inflight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, path):
+        with self._lock:
+            if path in self._inflight:
+                return
+            self._inflight.add(path)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="statcache")
+            executor = self._executor
+        try:
+            executor.submit(self._refresh, path)
+        except RuntimeError:  # shut down meanwhile
+            with self._lock:
+                self._inflight.discard(path)
+
+    def _refresh(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        with self._lock:
+            old = self._entries.get(path)
+            self._entries[path] = (time.monotonic(), st)
+            self._inflight.discard(path)
+            if old is None or _stat_key(old[1]) != _stat_key(st):
+                self.generation += 1
+        return st
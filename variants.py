@@ -0,0 +1,176 @@
+"""Lo/Hi (and further LOD) variant families of .blend libraries.
+
+A family is every file that shares a folder and a stem once the level's
+marker is removed. With the rules ``"_Lo, proxy/; _LOD2"`` that is
+``Tree.blend`` (level 0, full detail), ``Tree_Lo.blend`` and
+``proxy/Tree.blend`` (level 1), ``Tree_LOD2.blend`` (level 2). The
+markers come from NamingRules; VariantIndex scans each asset folder once on
+a worker thread and answers lookups from memory afterwards.
+Kept free of bpy.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_RULES = "_Lo"  # the add-on's original suffix; anything wider is opt-in
+
+
+class NamingRules:
+    """Markers for each level below full detail.
+
+    Parsed from text such as ``"_Lo, proxy/; _LOD2"``: levels are separated
+    by ';', markers by ','. A marker is an optional subfolder ending in '/'
+    followed by a stem suffix. Level 0 is always the bare stem.
+    """
+
+    def __init__(self, levels, source=""):
+        self.source = source
+        self.levels = [[]] + [list(markers) for markers in levels]
+        # longest markers first so "_Low" wins over "_Lo"
+        self._markers = sorted(
+            ((level, subdir, suffix) for level, markers in enumerate(self.levels)
+             for subdir, suffix in markers),
+            key=lambda m: (len(m[1]) + len(m[2])), reverse=True)
+        self._name_suffixes = tuple(sorted({suffix for _, _, suffix in self._markers if suffix},
+                                           key=len, reverse=True))
+
+    @classmethod
+    def parse(cls, text):
+        levels = []
+        for level_text in (text or "").split(";"):
+            markers = []
+            for token in level_text.split(","):
+                token = token.strip().replace("\\", "/")
+                if not token:
+                    continue
+                subdir, _, suffix = token.rpartition("/")
+                markers.append((subdir.strip("/"), suffix))
+            if markers:
+                levels.append(markers)
+        return cls(levels, text)
+
+    @property
+    def depth(self):
+        """Number of levels, full detail included."""
+        return len(self.levels)
+
+    def name_suffixes(self):
+        """Stem suffixes of every reduced level, longest first (for datablock names)."""
+        return self._name_suffixes
+
+    def subfolders(self):
+        return sorted({subdir for _, subdir, _ in self._markers if subdir})
+
+    def classify(self, path):
+        """(family folder, stem, level) of a .blend path, without touching the disk."""
+        folder, filename = os.path.split(os.path.normpath(path))
+        stem = filename[:-6] if filename.lower().endswith(".blend") else filename
+        for level, subdir, suffix in self._markers:
+            if subdir:
+                head, tail = os.path.split(folder)
+                if os.path.normcase(tail) != os.path.normcase(subdir.replace("/", os.sep)) or not head:
+                    continue
+            if suffix and (not stem.endswith(suffix) or stem == suffix):
+                continue
+            return (os.path.dirname(folder) if subdir else folder,
+                    stem[:-len(suffix)] if suffix else stem, level)
+        return folder, stem, 0
+
+    def candidate(self, folder, stem, level):
+        """Path the first marker of level would give, whether or not it exists."""
+        if level == 0 or level >= len(self.levels):
+            return os.path.join(folder, stem + ".blend")
+        subdir, suffix = self.levels[level][0]
+        return os.path.join(folder, *([subdir] if subdir else []), stem + suffix + ".blend")
+
+
+class VariantIndex:
+    """Variant families per asset folder, scanned in the background and cached for ttl seconds."""
+
+    def __init__(self, rules, ttl=60.0):
+        self.rules = rules
+        self.ttl = ttl
+        self.generation = 0  # bumped whenever a scan finishes
+        self._folders = {}  # folder -> (monotonic time scanned, {stem: {level: path}})
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def set_rules(self, rules):
+        with self._lock:
+            self.rules = rules
+            self._folders.clear()
+            self.generation += 1
+
+    def family(self, path, wait=False):
+        """{level: path} of path's family, or None while its folder is not scanned yet."""
+        folder, stem, _ = self.rules.classify(path)
+        with self._lock:
+            entry = self._folders.get(folder)
+        if entry is None and wait:
+            entry = (time.monotonic(), self._scan(folder))
+        elif entry is None or time.monotonic() - entry[0] >= self.ttl:
+            self._submit(folder)
+        return None if entry is None else dict(entry[1].get(stem, {}))
+
+    def prefetch(self, paths):
+        folders = {self.rules.classify(p)[0] for p in paths}
+        now = time.monotonic()
+        with self._lock:
+            stale = [f for f in folders if f not in self._folders or now - self._folders[f][0] >= self.ttl]
+        for folder in stale:
+            self._submit(folder)
+
+    def invalidate(self, folder=None):
+        with self._lock:
+            if folder is None:
+                self._folders.clear()
+            else:
+                self._folders.pop(folder, None)
+
+    @property
+    def pending(self):
+        return len(self._inflight)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._inflight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, folder):
+        with self._lock:
+            if folder in self._inflight:
+                return
+            self._inflight.add(folder)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="variants")
+            executor = self._executor
+        try:
+            executor.submit(self._scan, folder)
+        except RuntimeError:  # shut down meanwhile
+            with self._lock:
+                self._inflight.discard(folder)
+
+    def _scan(self, folder):
+        rules = self.rules
+        families = {}
+        for directory in [folder] + [os.path.join(folder, d) for d in rules.subfolders()]:
+            try:
+                with os.scandir(directory) as it:
+                    names = [e.path for e in it if e.name.lower().endswith(".blend") and e.is_file()]
+            except OSError:
+                continue
+            for path in names:
+                family_folder, stem, level = rules.classify(path)
+                if os.path.normcase(family_folder) == os.path.normcase(folder):
+                    families.setdefault(stem, {}).setdefault(level, path)
+        with self._lock:
+            if rules is self.rules:
+                self._folders[folder] = (time.monotonic(), families)
+                self.generation += 1
+            self._inflight.discard(folder)
+        return families
@@ -0,0 +1,123 @@
+"""Pool of headless ``blender -b`` processes for bulk library work.
+
+Paths are split into chunks and each chunk is handed to one background
+Blender running a worker script. The script writes a JSON object
+{path: result} to the output file given on its command line; results are
+pushed onto a queue the add-on drains from a timer on the main thread.
+Kept free of bpy so it can be used from any thread.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def default_worker_count():
+    return max(1, os.cpu_count() or 1)
+
+
+def worker_script(name):
+    """Absolute path of a worker script shipped next to this module."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+
+class BlenderPool:
+    """Run a worker script over many paths with up to `workers` Blender processes."""
+
+    def __init__(self, blender, script, workers=0, chunk_size=4, timeout=None, extra_args=(), skip=None):
+        self.blender = blender
+        self.script = script
+        self.skip = skip  # optional callable(path) -> result, or None if the path needs a worker
+        self.workers = workers or default_worker_count()
+        self.chunk_size = max(1, chunk_size)
+        self.timeout = timeout
+        self.extra_args = list(extra_args)
+        self.results = queue.Queue()
+        self.total = 0
+        self.done = 0
+        self._lock = threading.Lock()
+        self._procs = set()
+        self._cancelled = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def submit(self, paths):
+        """Queue paths for processing; results arrive as (path, dict) on self.results."""
+        paths = list(paths)
+        self.total += len(paths)
+        for i in range(0, len(paths), self.chunk_size):
+            self._executor.submit(self._run_chunk, paths[i:i + self.chunk_size])
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+    def cancel(self):
+        """Stop queued chunks and terminate the running Blender processes."""
+        self._cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for proc in self._procs:
+                proc.kill()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def _run_chunk(self, paths):
+        if self._cancelled.is_set():
+            return
+        if self.skip is not None:
+            todo = []
+            for path in paths:
+                result = self.skip(path)
+                if result is None:
+                    todo.append(path)
+                else:
+                    self._finish(path, result)
+            paths = todo
+            if not paths:
+                return
+        fd, out_path = tempfile.mkstemp(prefix="linkmanager_", suffix=".json")
+        os.close(fd)
+        cmd = [self.blender, "-b", "--factory-startup", "--python-exit-code", "1",
+               "--python", self.script, "--", out_path, *self.extra_args, *paths]
+        results = {}
+        error = None
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            with self._lock:
+                self._procs.add(proc)
+            try:
+                _, stderr = proc.communicate(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                _, stderr = proc.communicate()
+                error = "timed out"
+            finally:
+                with self._lock:
+                    self._procs.discard(proc)
+            if proc.returncode and not error:
+                lines = (stderr or b"").decode("utf-8", "replace").strip().splitlines()
+                error = lines[-1] if lines else f"exit code {proc.returncode}"
+            if os.path.getsize(out_path):
+                with open(out_path, encoding="utf-8") as f:
+                    results = json.load(f)
+        except (OSError, ValueError) as e:
+            error = str(e)
+        finally:
+            try:
+                os.remove(out_path)
+            except OSError:
+                pass
+
+        for path in paths:
+            self._finish(path, results.get(path) or {"error": error or "no result"})
+
+    def _finish(self, path, result):
+        if not self._cancelled.is_set():
+            self.results.put((path, result))
+        with self._lock:
+            self.done += 1